@@ -1,11 +1,37 @@
 import logging
-from flask import Blueprint, jsonify, request
-from backend.services.scheduler import get_scheduler
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict
+import orjson
+from flask import Blueprint, Response, jsonify, request
+from werkzeug.http import http_date
+from backend.database.connection import get_db
+from backend.models import Trader, TraderPerformance, Position, TradeOpportunity
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint("api", __name__)
 
+
+def _json_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively, matching jsonify's output."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):
+        # jsonify sends dates as HTTP dates, not orjson's ISO-8601
+        return http_date(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """Build a JSON response with orjson for the large list endpoints."""
+    return Response(
+        orjson.dumps(payload, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME),
+        status=status,
+        mimetype="application/json"
+    )
+
+
 @api_bp.route("/", methods=["GET"])
 def api_info():
     """API information endpoint."""
@@ -65,7 +91,7 @@ def get_top_losers():
         }
         
         logger.info(f"Returning response with {len(losers)} items")
-        return jsonify(response), 200
+        return _json_response(response)
         
     except Exception as e:
         logger.error(f"Error in /api/losers endpoint: {e}", exc_info=True)
@@ -87,11 +113,11 @@ def get_opportunities():
             }), 503
         
         opportunities = analyzer.get_active_opportunities()
-        return jsonify({
+        return _json_response({
             "status": "success",
             "data": opportunities,
             "count": len(opportunities)
-        }), 200
+        })
     except Exception as e:
         logger.error(f"Error getting opportunities: {e}")
         return jsonify({
@@ -285,11 +311,17 @@ def analyze_positions():
         }), 500
 
 
+def _get_scheduler():
+    """Import the scheduler on first use so app startup skips the service stack."""
+    from backend.services.scheduler import get_scheduler
+    return get_scheduler()
+
+
 @api_bp.route("/scheduler/status", methods=["GET"])
 def get_scheduler_status():
     """Get real-time data collection scheduler status."""
     try:
-        scheduler = get_scheduler()
+        scheduler = _get_scheduler()
         status = scheduler.get_status()
         return jsonify({
             "status": "success",
@@ -307,7 +339,7 @@ def get_scheduler_status():
 def start_scheduler_endpoint():
     """Manually start the data collection scheduler."""
     try:
-        scheduler = get_scheduler()
+        scheduler = _get_scheduler()
         if scheduler.running:
             return jsonify({
                 "status": "success",
@@ -331,7 +363,7 @@ def start_scheduler_endpoint():
 def stop_scheduler_endpoint():
     """Manually stop the data collection scheduler."""
     try:
-        scheduler = get_scheduler()
+        scheduler = _get_scheduler()
         if not scheduler.running:
             return jsonify({
                 "status": "success",
@@ -6,7 +6,6 @@ from flask_cors import CORS
 from backend.api.routes import api_bp
 from backend.database.connection import init_db, test_connection
 from backend.config import DEBUG, API_HOST, API_PORT
-from backend.services.scheduler import start_scheduler, stop_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +63,8 @@ def main():
     
     # Start background data collection scheduler
     try:
+        from backend.services.scheduler import start_scheduler, stop_scheduler
+        
         start_scheduler()
         logger.info("Real-time data collection scheduler started (30s intervals)")
         
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple, Union
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from backend.models import Trader, TraderPerformance, Position
+
+# Metrics a same-day rerun replaces in an existing performance row
+REFRESHED_PERFORMANCE_COLUMNS = ("pnl_percentage", "pnl_absolute", "account_value")
+
+
+def bulk_connection(db: Session, page_size: int = 500) -> Connection:
+    """Return the session's connection for Core writes, sending page_size rows per INSERT.
+
+    The loaders only write rows, so they skip the ORM and let SQLAlchemy batch
+    executemany() calls into multi-VALUES statements.
+    """
+    return db.connection(execution_options={"insertmanyvalues_page_size": page_size})
+
+
+def upsert_traders(conn: Connection, addresses: Iterable[str], now: datetime) -> Dict[str, int]:
+    """Map addresses to trader ids, inserting unknown ones in a single statement.
+
+    Known traders are looked up in one query; the address constraint skips any
+    inserted concurrently, and those are left out of the returned mapping.
+    """
+    addresses = list(addresses)
+    trader_ids = dict(conn.execute(
+        select(Trader.address, Trader.id).where(Trader.address.in_(addresses))
+    ).all())
+
+    new_trader_rows = [
+        {
+            "address": address,
+            "first_seen": now,
+            "last_updated": now,
+            "is_active": True
+        }
+        for address in addresses if address not in trader_ids
+    ]
+    if new_trader_rows:
+        trader_ids.update(conn.execute(
+            pg_insert(Trader.__table__)
+            .on_conflict_do_nothing(index_elements=["address"])
+            .returning(Trader.address, Trader.id),
+            new_trader_rows
+        ).all())
+    return trader_ids
+
+
+def upsert_performance(conn: Connection, rows: List[Dict[str, Any]]) -> None:
+    """Insert daily performance rows, refreshing the metrics of rows that already exist."""
+    if not rows:
+        return
+    stmt = pg_insert(TraderPerformance.__table__)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["trader_id", "date"],
+            set_={key: stmt.excluded[key] for key in REFRESHED_PERFORMANCE_COLUMNS}
+        ),
+        rows
+    )
+
+
+def insert_open_positions(conn: Connection, rows: List[Dict[str, Any]]) -> Dict[Tuple[int, str, str], int]:
+    """Insert open positions, skipping any the trader already has open.
+
+    Returns the ids of the inserted positions keyed by (trader_id, coin, side).
+    """
+    if not rows:
+        return {}
+    result = conn.execute(
+        pg_insert(Position.__table__)
+        .on_conflict_do_nothing(
+            index_elements=["trader_id", "coin", "side"],
+            index_where=text("status = 'OPEN'")
+        )
+        .returning(Position.trader_id, Position.coin, Position.side, Position.id),
+        rows
+    )
+    return {(trader_id, coin, side): position_id for trader_id, coin, side, position_id in result}
+
+
+def table_counts(db: Union[Session, Connection], *models: Any) -> Tuple[int, ...]:
+    """Count the rows of each model's table in a single round-trip."""
+    return tuple(db.execute(select(*(
+        select(func.count()).select_from(model).scalar_subquery() for model in models
+    ))).one())
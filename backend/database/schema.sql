@@ -4,6 +4,7 @@
 CREATE TABLE IF NOT EXISTS traders (
     id SERIAL PRIMARY KEY,
     address VARCHAR(42) UNIQUE NOT NULL,
+    short_address VARCHAR(20),
     first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_active BOOLEAN DEFAULT TRUE
@@ -95,11 +96,18 @@ CREATE TABLE IF NOT EXISTS api_logs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Columns added after the initial schema
+ALTER TABLE traders ADD COLUMN IF NOT EXISTS short_address VARCHAR(20);
+UPDATE traders SET short_address = LEFT(address, 6) || '...' || RIGHT(address, 4) WHERE short_address IS NULL;
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_traders_address ON traders(address);
 CREATE INDEX IF NOT EXISTS idx_trader_performance_trader_id_date ON trader_performance(trader_id, date);
+CREATE INDEX IF NOT EXISTS idx_trader_performance_losers ON trader_performance(pnl_percentage) INCLUDE (account_value) WHERE pnl_percentage < 0;
 CREATE INDEX IF NOT EXISTS idx_positions_trader_id_status ON positions(trader_id, status);
 CREATE INDEX IF NOT EXISTS idx_positions_opened_at ON positions(opened_at);
+-- Databases with duplicate open positions need scripts/close_duplicate_positions.py first
+CREATE UNIQUE INDEX IF NOT EXISTS uq_positions_open_trader_coin_side ON positions(trader_id, coin, side) WHERE status = 'OPEN';
 CREATE INDEX IF NOT EXISTS idx_trade_opportunities_status ON trade_opportunities(status);
 CREATE INDEX IF NOT EXISTS idx_api_logs_created_at ON api_logs(created_at);
 
@@ -0,0 +1,58 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+from sqlalchemy import Numeric, String, Table
+from backend.models import Position
+
+
+def numeric_str(value: Any) -> Optional[str]:
+    """Pass a NUMERIC value as a string for Postgres to cast, keeping missing values NULL."""
+    return None if value is None else str(value)
+
+
+def check_row(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Raise ValueError if the database would reject row for table.
+
+    Bulk loaders send many rows in one INSERT, where a single bad value aborts
+    the whole statement; checking rows as they are built lets the caller drop
+    just the offending record instead.
+    """
+    for name, value in row.items():
+        column = table.c[name]
+        if value is None:
+            if not column.nullable:
+                raise ValueError(f"{name} is required")
+            continue
+        if isinstance(column.type, Numeric):
+            scale = column.type.scale or 0
+            try:
+                number = Decimal(str(value)).quantize(Decimal(1).scaleb(-scale))
+            except InvalidOperation:
+                raise ValueError(f"{name} is not a number: {value!r}") from None
+            if not number.is_finite() or number.adjusted() >= column.type.precision - scale:
+                raise ValueError(f"{name} is out of range: {value!r}")
+        elif isinstance(column.type, String) and column.type.length:
+            if len(value) > column.type.length:
+                raise ValueError(f"{name} is longer than {column.type.length} characters")
+    return row
+
+
+def position_row(trader_id: int, pos_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Build a positions row from a normalized get_open_positions() entry.
+
+    Raises ValueError if the row would be rejected by the database.
+    """
+    return check_row(Position.__table__, {
+        "trader_id": trader_id,
+        "coin": pos_data["coin"],
+        "side": pos_data["side"],
+        "entry_price": numeric_str(pos_data["entry_price"]),
+        "size": numeric_str(pos_data["size"]),
+        "leverage": numeric_str(pos_data.get("leverage", 1)),
+        "position_value": numeric_str(pos_data.get("position_value", 0)),
+        "unrealized_pnl": numeric_str(pos_data.get("unrealized_pnl", 0)),
+        "margin_used": numeric_str(pos_data.get("margin_used", 0)),
+        "liquidation_price": numeric_str(pos_data.get("liquidation_price", 0)),
+        "opened_at": now,
+        "status": "OPEN"
+    })
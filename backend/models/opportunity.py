@@ -1,11 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index
 from sqlalchemy.orm import relationship
 from backend.database.connection import Base
 
 
 class TradeOpportunity(Base):
     __tablename__ = "trade_opportunities"
+    __table_args__ = (
+        Index("idx_trade_opportunities_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True)
     position_id = Column(Integer, ForeignKey("positions.id", ondelete="CASCADE"))
@@ -33,6 +36,22 @@ class TradeOpportunity(Base):
     def is_active(self):
         """Check if opportunity is still active."""
         return self.status == "ACTIVE"
+    
+    def as_dict(self):
+        """Serialize own columns to plain JSON-ready values (no relationship loads)."""
+        return {
+            "id": self.id,
+            "position_id": self.position_id,
+            "trader_id": self.trader_id,
+            "coin": self.coin,
+            "loser_side": self.loser_side,
+            "suggested_side": self.suggested_side,
+            "loser_entry_price": float(self.loser_entry_price),
+            "suggested_entry_price": float(self.suggested_entry_price) if self.suggested_entry_price is not None else None,
+            "confidence_score": float(self.confidence_score) if self.confidence_score is not None else None,
+            "status": self.status,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
 
 
 class OurTrade(Base):
@@ -1,11 +1,24 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, Date, Numeric, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Date, Numeric, DateTime, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from backend.database.connection import Base
 
 
 class TraderPerformance(Base):
     __tablename__ = "trader_performance"
+    __table_args__ = (
+        # One snapshot per trader per day; loaders upsert against it
+        UniqueConstraint("trader_id", "date", name="trader_performance_trader_id_date_key"),
+        Index("idx_trader_performance_trader_id_date", "trader_id", "date"),
+        # Covers the top-losers filter and sort on losing snapshots only
+        Index(
+            "idx_trader_performance_losers",
+            "pnl_percentage",
+            postgresql_include=["account_value"],
+            postgresql_where=text("pnl_percentage < 0"),
+            sqlite_where=text("pnl_percentage < 0")
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
     trader_id = Column(Integer, ForeignKey("traders.id", ondelete="CASCADE"), nullable=False)
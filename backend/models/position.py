@@ -1,11 +1,25 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from backend.database.connection import Base
 
 
 class Position(Base):
     __tablename__ = "positions"
+    __table_args__ = (
+        Index("idx_positions_trader_id_status", "trader_id", "status"),
+        Index("idx_positions_opened_at", "opened_at"),
+        # A trader holds at most one open position per coin and side
+        Index(
+            "uq_positions_open_trader_coin_side",
+            "trader_id",
+            "coin",
+            "side",
+            unique=True,
+            postgresql_where=text("status = 'OPEN'"),
+            sqlite_where=text("status = 'OPEN'")
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
     trader_id = Column(Integer, ForeignKey("traders.id", ondelete="CASCADE"), nullable=False)
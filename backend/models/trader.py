@@ -1,14 +1,25 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from backend.database.connection import Base
 
 
+def shorten_address(address):
+    """Return shortened address for display."""
+    return f"{address[:6]}...{address[-4:]}"
+
+
+def _default_short_address(context):
+    """Fill short_address for inserts that bypass the ORM (bulk Core inserts)."""
+    return shorten_address(context.get_current_parameters()["address"])
+
+
 class Trader(Base):
     __tablename__ = "traders"
     
     id = Column(Integer, primary_key=True)
     address = Column(String(42), unique=True, nullable=False)
+    short_address = Column(String(20), default=_default_short_address)
     first_seen = Column(DateTime, default=datetime.utcnow)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
@@ -21,7 +32,8 @@ class Trader(Base):
     def __repr__(self):
         return f"<Trader(address={self.address}, id={self.id})>"
     
-    @property
-    def short_address(self):
-        """Return shortened address for display."""
-        return f"{self.address[:6]}...{self.address[-4:]}"
\ No newline at end of file
+    @validates("address")
+    def _set_short_address(self, key, address):
+        """Keep the stored short_address in sync with address."""
+        self.short_address = shorten_address(address)
+        return address
\ No newline at end of file
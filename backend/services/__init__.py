@@ -1,9 +1,10 @@
-from .hyperliquid_api import HyperliquidAPI
+from .hyperliquid_api import HyperliquidAPI, get_api
 from .data_collector import DataCollector
 from .analyzer import TradingAnalyzer
 
 __all__ = [
     "HyperliquidAPI",
+    "get_api",
     "DataCollector",
     "TradingAnalyzer"
 ]
\ No newline at end of file
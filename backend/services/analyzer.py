@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from backend.database.connection import get_db
 from backend.models import Trader, Position, TradeOpportunity, TraderPerformance
 from backend.services.hyperliquid_api import HyperliquidAPI
@@ -14,8 +14,8 @@ logger = logging.getLogger(__name__)
 class TradingAnalyzer:
     """Analyzes trader positions and generates counter-trading opportunities."""
     
-    def __init__(self):
-        self.api = HyperliquidAPI()
+    def __init__(self, api: Optional[HyperliquidAPI] = None):
+        self.api = api or HyperliquidAPI()
         self.confidence_threshold = 70.0  # Minimum confidence score to generate opportunity
         logger.info("Initialized TradingAnalyzer")
     
@@ -28,13 +28,15 @@ class TradingAnalyzer:
                 # Get positions opened in the last hour that haven't been analyzed
                 recent_positions = self._get_recent_positions(db)
                 
+                # Find positions we already created an opportunity for in one query
+                analyzed_ids = set(db.scalars(
+                    select(TradeOpportunity.position_id).where(
+                        TradeOpportunity.position_id.in_([position.id for position in recent_positions])
+                    )
+                ))
+                
                 for position in recent_positions:
-                    # Check if we already created an opportunity for this position
-                    existing = db.query(TradeOpportunity).filter_by(
-                        position_id=position.id
-                    ).first()
-                    
-                    if not existing:
+                    if position.id not in analyzed_ids:
                         opportunity = self._analyze_position(db, position)
                         if opportunity:
                             db.add(opportunity)
@@ -148,41 +150,36 @@ class TradingAnalyzer:
         logger.info("get_active_opportunities called")
         try:
             with get_db() as db:
-                # Query opportunities with their positions and traders
-                opportunities = db.query(TradeOpportunity).filter_by(
-                    status="ACTIVE"
-                ).join(Trader).outerjoin(Position).all()
-                
-                logger.info(f"Found {len(opportunities)} active opportunities")
+                # Stream opportunities with their trader address and position in one query
+                stmt = (
+                    select(TradeOpportunity, Trader.address, Position)
+                    .join(Trader, TradeOpportunity.trader_id == Trader.id)
+                    .outerjoin(Position, TradeOpportunity.position_id == Position.id)
+                    .where(TradeOpportunity.status == "ACTIVE")
+                    .execution_options(yield_per=1000)
+                )
                 
                 results = []
-                for opp in opportunities:
-                    result = {
-                        "id": opp.id,
-                        "trader_address": opp.trader.address,
-                        "coin": opp.coin,
-                        "loser_side": opp.loser_side,
-                        "suggested_side": opp.suggested_side,
-                        "loser_entry_price": float(opp.loser_entry_price),
-                        "suggested_entry_price": float(opp.suggested_entry_price) if opp.suggested_entry_price else None,
-                        "confidence_score": float(opp.confidence_score),
-                        "transaction_hash": opp.position.transaction_hash if opp.position else None,
-                        "created_at": opp.created_at.isoformat(),
+                for opp, trader_address, position in db.execute(stmt):
+                    opened_at = position.opened_at if position and position.opened_at else opp.created_at
+                    result = opp.as_dict()
+                    result.update({
+                        "trader_address": trader_address,
+                        "transaction_hash": position.transaction_hash if position else None,
                         # Raw data
-                        "position_size": float(opp.position.size) if opp.position else None,
-                        "position_value": float(opp.position.position_value) if opp.position and opp.position.position_value else None,
-                        "leverage": float(opp.position.leverage) if opp.position and opp.position.leverage else None,
-                        "unrealized_pnl": float(opp.position.unrealized_pnl) if opp.position and opp.position.unrealized_pnl else None,
-                        "opened_at": (opp.position.opened_at.isoformat() if opp.position and opp.position.opened_at 
-                                    else opp.created_at.isoformat()),
+                        "position_size": float(position.size) if position else None,
+                        "position_value": float(position.position_value) if position and position.position_value else None,
+                        "leverage": float(position.leverage) if position and position.leverage else None,
+                        "unrealized_pnl": float(position.unrealized_pnl) if position and position.unrealized_pnl else None,
+                        "opened_at": opened_at.isoformat(),
                         # Formatted display strings (ready for frontend)
-                        "formatted_size": self._format_size(opp.position.size if opp.position else None, opp.coin),
+                        "formatted_size": self._format_size(position.size if position else None, opp.coin),
                         "formatted_price": f"${float(opp.loser_entry_price):.4f}",
-                        "formatted_leverage": f"{float(opp.position.leverage)}x" if opp.position and opp.position.leverage else None,
-                        "formatted_pnl": self._format_currency(opp.position.unrealized_pnl if opp.position and opp.position.unrealized_pnl else None),
-                        "formatted_time_ago": self._get_time_ago(opp.position.opened_at if opp.position and opp.position.opened_at else opp.created_at),
-                        "explorer_url": self._get_explorer_url(opp.trader.address, opp.position.transaction_hash if opp.position else None)
-                    }
+                        "formatted_leverage": f"{float(position.leverage)}x" if position and position.leverage else None,
+                        "formatted_pnl": self._format_currency(position.unrealized_pnl if position and position.unrealized_pnl else None),
+                        "formatted_time_ago": self._get_time_ago(opened_at),
+                        "explorer_url": self._get_explorer_url(trader_address, position.transaction_hash if position else None)
+                    })
                     results.append(result)
                 
                 logger.info(f"Returning {len(results)} opportunities")
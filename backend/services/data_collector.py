@@ -1,9 +1,10 @@
 import logging
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from backend.database.connection import get_db
 from backend.models import Trader, TraderPerformance, Position
 from backend.services.hyperliquid_api import HyperliquidAPI
@@ -14,25 +15,15 @@ logger = logging.getLogger(__name__)
 class DataCollector:
     """Service for collecting and storing trader data from Hyperliquid."""
     
-    def __init__(self):
-        self.api = HyperliquidAPI()
+    def __init__(self, api: Optional[HyperliquidAPI] = None):
+        self.api = api or HyperliquidAPI()
         logger.info("Initialized DataCollector")
     
     def collect_trader_data(self, address: str) -> bool:
         """Collect and store all data for a single trader."""
         try:
             with get_db() as db:
-                # Get or create trader
-                trader = self._get_or_create_trader(db, address)
-                
-                # Update performance metrics
-                self._update_trader_performance(db, trader)
-                
-                # Update positions
-                self._update_trader_positions(db, trader)
-                
-                # Update last_updated timestamp
-                trader.last_updated = datetime.utcnow()
+                self._collect_trader(db, address)
                 db.commit()
                 
                 logger.info(f"Successfully collected data for trader {address}")
@@ -42,20 +33,93 @@ class DataCollector:
             logger.error(f"Error collecting data for trader {address}: {e}")
             return False
     
-    def collect_multiple_traders(self, addresses: List[str]) -> Dict[str, bool]:
-        """Collect data for multiple traders."""
+    def collect_multiple_traders(self, addresses: List[str], batch: bool = False) -> Dict[str, bool]:
+        """Collect data for multiple traders, in one transaction when batch is set."""
+        if batch:
+            return self._collect_batch(addresses)
+        
+        # Register any new traders up front in one statement
+        try:
+            with get_db() as db:
+                self._ensure_traders(db, addresses)
+                db.commit()
+        except Exception as e:
+            logger.error(f"Error registering traders: {e}")
+        
         results = {}
         for address in addresses:
             results[address] = self.collect_trader_data(address)
         return results
     
+    def _collect_batch(self, addresses: List[str]) -> Dict[str, bool]:
+        """Collect all traders in one session and commit once at the end."""
+        results = {address: False for address in addresses}
+        try:
+            with get_db() as db:
+                self._ensure_traders(db, addresses)
+                
+                for address in addresses:
+                    # Savepoint per trader so one failure doesn't discard the batch
+                    savepoint = db.begin_nested()
+                    try:
+                        self._collect_trader(db, address)
+                        savepoint.commit()
+                        results[address] = True
+                    except Exception as e:
+                        savepoint.rollback()
+                        logger.error(f"Error collecting data for trader {address}: {e}")
+                
+                db.commit()
+                logger.info(f"Committed collection batch for {sum(results.values())}/{len(addresses)} traders")
+                
+        except Exception as e:
+            logger.error(f"Error committing collection batch: {e}")
+            results = {address: False for address in addresses}
+        
+        return results
+    
+    def _collect_trader(self, db: Session, address: str):
+        """Stage performance and position updates for a trader without committing."""
+        # Get or create trader
+        trader = self._get_or_create_trader(db, address)
+        
+        # Update performance metrics
+        self._update_trader_performance(db, trader)
+        
+        # Update positions
+        self._update_trader_positions(db, trader)
+        
+        # Update last_updated timestamp
+        trader.last_updated = datetime.utcnow()
+    
+    def _ensure_traders(self, db: Session, addresses: List[str]):
+        """Bulk insert traders that don't exist yet."""
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return
+        
+        if db.get_bind().dialect.name == "postgresql":
+            # Let the unique constraint on address skip existing traders
+            stmt = pg_insert(Trader).on_conflict_do_nothing(index_elements=["address"])
+            new_addresses = addresses
+        else:
+            existing = set(db.scalars(
+                select(Trader.address).where(Trader.address.in_(addresses))
+            ))
+            stmt = insert(Trader)
+            new_addresses = [address for address in addresses if address not in existing]
+        
+        if new_addresses:
+            db.execute(stmt, [{"address": address, "is_active": True} for address in new_addresses])
+            logger.info(f"Registered up to {len(new_addresses)} new traders")
+    
     def _get_or_create_trader(self, db: Session, address: str) -> Trader:
         """Get existing trader or create new one."""
         trader = db.query(Trader).filter_by(address=address).first()
         if not trader:
             trader = Trader(address=address)
             db.add(trader)
-            db.commit()
+            db.flush()
             logger.info(f"Created new trader record for {address}")
         return trader
     
@@ -184,11 +248,6 @@ class DataCollector:
             with get_db() as db:
                 logger.info("Database connection established")
                 
-                # First, let's check if we have any traders at all
-                trader_count = db.query(Trader).count()
-                perf_count = db.query(TraderPerformance).count()
-                logger.info(f"Database has {trader_count} traders and {perf_count} performance records")
-                
                 # Query traders and their performance directly using SQLAlchemy ORM
                 from sqlalchemy import text
                 logger.info("Executing SQL query for top losers")
@@ -212,7 +271,8 @@ class DataCollector:
                     ORDER BY tp.pnl_percentage ASC
                     LIMIT :limit
                     """),
-                    {"limit": limit}
+                    {"limit": limit},
+                    execution_options={"yield_per": 1000}
                 )
                 
                 logger.info("SQL query executed successfully")
@@ -308,52 +368,60 @@ class DataCollector:
             return 0
     
     def _calculate_performance_from_positions(self, db: Session, trader: Trader) -> Dict[str, Any]:
-        """Calculate performance metrics from position data."""
-        from datetime import datetime, timedelta
-        
+        """Calculate performance metrics from position data in a single aggregate query."""
         # Get positions from last 30 days
         cutoff_date = datetime.utcnow() - timedelta(days=30)
-        positions = db.query(Position).filter(
+        
+        is_closed = and_(Position.status == "CLOSED", Position.realized_pnl.isnot(None))
+        realized = case((is_closed, Position.realized_pnl))
+        unrealized = func.coalesce(Position.unrealized_pnl, 0)
+        
+        stats = db.query(
+            func.count(Position.id).label("total"),
+            # Realized PnL over closed positions
+            func.count(realized).label("closed"),
+            func.sum(realized).label("closed_pnl"),
+            func.count(case((realized > 0, 1))).label("closed_wins"),
+            func.sum(case((realized > 0, realized))).label("closed_win_pnl"),
+            func.count(case((realized < 0, 1))).label("closed_losses"),
+            func.sum(case((realized < 0, realized))).label("closed_loss_pnl"),
+            # Unrealized PnL over all positions
+            func.sum(unrealized).label("open_pnl"),
+            func.count(case((unrealized > 0, 1))).label("open_wins"),
+            func.sum(case((unrealized > 0, unrealized))).label("open_win_pnl"),
+            func.count(case((unrealized < 0, 1))).label("open_losses"),
+            func.sum(case((unrealized < 0, unrealized))).label("open_loss_pnl")
+        ).filter(
             Position.trader_id == trader.id,
             Position.opened_at >= cutoff_date
-        ).all()
+        ).one()
         
-        if not positions:
+        if not stats.total:
             return self._empty_performance_dict()
         
-        # Calculate metrics
-        total_positions = len(positions)
-        closed_positions = [p for p in positions if p.status == "CLOSED" and p.realized_pnl is not None]
-        
-        # If no closed positions, use unrealized PnL from open positions
-        if not closed_positions:
-            # Use current unrealized PnL for open positions
-            total_pnl = sum(float(p.unrealized_pnl or 0) for p in positions)
-            winning_positions = [p for p in positions if (p.unrealized_pnl or 0) > 0]
-            losing_positions = [p for p in positions if (p.unrealized_pnl or 0) < 0]
-            
-            win_rate = (len(winning_positions) / total_positions * 100) if total_positions > 0 else 0
-            avg_win = sum(float(p.unrealized_pnl or 0) for p in winning_positions) / len(winning_positions) if winning_positions else 0
-            avg_loss = sum(float(p.unrealized_pnl or 0) for p in losing_positions) / len(losing_positions) if losing_positions else 0
+        # Prefer realized PnL; fall back to unrealized PnL if nothing has closed yet
+        if stats.closed:
+            sample_size = stats.closed
+            total_pnl, wins, win_pnl, losses, loss_pnl = (
+                stats.closed_pnl, stats.closed_wins, stats.closed_win_pnl,
+                stats.closed_losses, stats.closed_loss_pnl
+            )
         else:
-            # Use realized PnL for closed positions
-            total_pnl = sum(float(p.realized_pnl or 0) for p in closed_positions)
-            winning_positions = [p for p in closed_positions if (p.realized_pnl or 0) > 0]
-            losing_positions = [p for p in closed_positions if (p.realized_pnl or 0) < 0]
-            
-            win_rate = (len(winning_positions) / len(closed_positions) * 100) if closed_positions else 0
-            avg_win = sum(float(p.realized_pnl or 0) for p in winning_positions) / len(winning_positions) if winning_positions else 0
-            avg_loss = sum(float(p.realized_pnl or 0) for p in losing_positions) / len(losing_positions) if losing_positions else 0
+            sample_size = stats.total
+            total_pnl, wins, win_pnl, losses, loss_pnl = (
+                stats.open_pnl, stats.open_wins, stats.open_win_pnl,
+                stats.open_losses, stats.open_loss_pnl
+            )
         
         return {
-            "pnl_absolute": total_pnl,
+            "pnl_absolute": float(total_pnl or 0),
             "pnl_percentage": 0,  # Will be calculated with account value
-            "win_rate": win_rate,
-            "total_trades": total_positions,
-            "winning_trades": len(winning_positions),
-            "losing_trades": len(losing_positions),
-            "avg_win": avg_win,
-            "avg_loss": avg_loss,
+            "win_rate": wins / sample_size * 100,
+            "total_trades": stats.total,
+            "winning_trades": wins,
+            "losing_trades": losses,
+            "avg_win": float(win_pnl) / wins if wins else 0,
+            "avg_loss": float(loss_pnl) / losses if losses else 0,
             "account_value": 0  # Will be set from API
         }
     
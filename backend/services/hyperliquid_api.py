@@ -1,8 +1,12 @@
 import os
 import logging
+from functools import cache
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
+import numpy as np
+from requests.adapters import HTTPAdapter
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 from dotenv import load_dotenv
@@ -11,6 +15,22 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections pooled per API host, shared by every request and poll
+HTTP_POOL_SIZE = int(os.getenv("HYPERLIQUID_HTTP_POOL_SIZE", 20))
+
+# Read-only template for traders with no recent fills
+_EMPTY_PERFORMANCE_METRICS = MappingProxyType({
+    "pnl_absolute": 0.0,
+    "pnl_percentage": 0.0,
+    "win_rate": 0.0,
+    "total_trades": 0,
+    "winning_trades": 0,
+    "losing_trades": 0,
+    "avg_win": 0.0,
+    "avg_loss": 0.0,
+    "account_value": 0.0
+})
+
 
 class HyperliquidAPI:
     """Wrapper for Hyperliquid API with error handling and rate limiting."""
@@ -22,6 +42,11 @@ class HyperliquidAPI:
             else constants.TESTNET_API_URL
         )
         self.info = Info(self.api_url, skip_ws=True)
+        # requests.Session is safe to share across threads; size the pool for fan-out
+        self.info.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        )
         logger.info(f"Initialized HyperliquidAPI for {self.env}")
     
     def get_user_state(self, address: str) -> Optional[Dict[str, Any]]:
@@ -78,47 +103,42 @@ class HyperliquidAPI:
             
             # Filter fills by date
             cutoff_time = int((datetime.utcnow() - timedelta(days=days)).timestamp() * 1000)
-            recent_fills = [f for f in fills if f.get("time", 0) > cutoff_time]
+            times = np.fromiter((f.get("time", 0) for f in fills), dtype=np.int64, count=len(fills))
+            pnl = np.fromiter((float(f.get("closedPnl", 0)) for f in fills), dtype=np.float64, count=len(fills))
+            pnl = pnl[times > cutoff_time]
             
-            if not recent_fills:
+            if not pnl.size:
                 return self._empty_performance_metrics()
             
-            # Calculate metrics
-            total_trades = len(recent_fills)
-            total_pnl = sum(Decimal(str(f.get("closedPnl", 0))) for f in recent_fills)
+            # Calculate metrics on float64 arrays rather than per-fill Decimals
+            total_trades = int(pnl.size)
+            total_pnl = float(pnl.sum())
             
             # Separate winning and losing trades
-            winning_trades = [f for f in recent_fills if Decimal(str(f.get("closedPnl", 0))) > 0]
-            losing_trades = [f for f in recent_fills if Decimal(str(f.get("closedPnl", 0))) < 0]
-            
-            win_rate = (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0
+            winning_pnl = pnl[pnl > 0]
+            losing_pnl = pnl[pnl < 0]
             
-            avg_win = (
-                sum(Decimal(str(f.get("closedPnl", 0))) for f in winning_trades) / len(winning_trades)
-                if winning_trades else Decimal(0)
-            )
-            avg_loss = (
-                sum(Decimal(str(f.get("closedPnl", 0))) for f in losing_trades) / len(losing_trades)
-                if losing_trades else Decimal(0)
-            )
+            win_rate = winning_pnl.size / total_trades * 100
+            avg_win = float(winning_pnl.mean()) if winning_pnl.size else 0.0
+            avg_loss = float(losing_pnl.mean()) if losing_pnl.size else 0.0
             
             # Get current account value
             user_state = self.get_user_state(address)
-            account_value = Decimal(str(user_state.get("marginSummary", {}).get("accountValue", 0))) if user_state else Decimal(0)
+            account_value = float(user_state.get("marginSummary", {}).get("accountValue", 0)) if user_state else 0.0
             
             # Calculate PnL percentage (approximate)
-            pnl_percentage = (total_pnl / account_value * 100) if account_value > 0 else 0
+            pnl_percentage = (total_pnl / account_value * 100) if account_value > 0 else 0.0
             
             return {
-                "pnl_absolute": float(total_pnl),
-                "pnl_percentage": float(pnl_percentage),
-                "win_rate": float(win_rate),
+                "pnl_absolute": total_pnl,
+                "pnl_percentage": pnl_percentage,
+                "win_rate": win_rate,
                 "total_trades": total_trades,
-                "winning_trades": len(winning_trades),
-                "losing_trades": len(losing_trades),
-                "avg_win": float(avg_win),
-                "avg_loss": float(avg_loss),
-                "account_value": float(account_value)
+                "winning_trades": int(winning_pnl.size),
+                "losing_trades": int(losing_pnl.size),
+                "avg_win": avg_win,
+                "avg_loss": avg_loss,
+                "account_value": account_value
             }
             
         except Exception as e:
@@ -127,17 +147,8 @@ class HyperliquidAPI:
     
     def _empty_performance_metrics(self) -> Dict[str, Any]:
         """Return empty performance metrics structure."""
-        return {
-            "pnl_absolute": 0.0,
-            "pnl_percentage": 0.0,
-            "win_rate": 0.0,
-            "total_trades": 0,
-            "winning_trades": 0,
-            "losing_trades": 0,
-            "avg_win": 0.0,
-            "avg_loss": 0.0,
-            "account_value": 0.0
-        }
+        # Copy so callers can still mutate the result
+        return dict(_EMPTY_PERFORMANCE_METRICS)
     
     def get_recent_fill_hash(self, address: str, coin: str, side: str, limit: int = 20) -> Optional[str]:
         """Get the most recent transaction hash for a position opening."""
@@ -199,4 +210,10 @@ class HyperliquidAPI:
             
         except Exception as e:
             logger.error(f"Error getting positions for {address}: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+@cache
+def get_api() -> HyperliquidAPI:
+    """Get the process-wide HyperliquidAPI, creating it on first use."""
+    return HyperliquidAPI()
@@ -14,9 +14,10 @@ logger = logging.getLogger(__name__)
 
 class DataScheduler:
     def __init__(self):
-        self.data_collector = DataCollector()
-        self.analyzer = TradingAnalyzer()
+        # One client (and connection pool) shared by every service
         self.api = HyperliquidAPI()
+        self.data_collector = DataCollector(self.api)
+        self.analyzer = TradingAnalyzer(self.api)
         self.running = False
         self.thread = None
         self.executor = ThreadPoolExecutor(max_workers=4)
@@ -1,49 +1,130 @@
 import os
 import pytest
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from backend.database.connection import Base, get_db
 from backend.models import Trader, TraderPerformance, Position
 from backend.app import create_app
 
-# Use in-memory SQLite for tests
+# Use in-memory SQLite for tests; each pytest-xdist worker process gets its own
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
-@pytest.fixture(scope="function")
-def test_db():
-    """Create a test database for each test."""
-    # Create engine
+@pytest.fixture(scope="session")
+def engine():
+    """Create the test engine and schema once per test session."""
     engine = create_engine(TEST_DATABASE_URL)
     
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
-    # Create session
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield engine
+    
+    # Clean up
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def test_db(engine):
+    """Provide a session whose changes are rolled back after each test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    
+    # Commits inside the test release savepoints instead of the outer transaction
+    TestSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint"
+    )
     session = TestSessionLocal()
     
     yield session
     
     # Clean up
     session.close()
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
-def test_app(test_db, monkeypatch):
-    """Create test Flask app."""
-    app = create_app()
-    app.config['TESTING'] = True
-    
-    # Monkey patch the get_db function
+def patched_get_db(test_db, monkeypatch):
+    """Route the services' and routes' get_db() to the test session."""
+    @contextmanager
     def mock_get_db():
         yield test_db
     
     import backend.database.connection
-    monkeypatch.setattr(backend.database.connection, "get_db", mock_get_db)
+    import backend.services.data_collector
+    import backend.services.analyzer
+    import backend.api.routes
+    for module in (
+        backend.database.connection,
+        backend.services.data_collector,
+        backend.services.analyzer,
+        backend.api.routes
+    ):
+        monkeypatch.setattr(module, "get_db", mock_get_db)
+    
+    return test_db
+
+
+class QueryCounter:
+    """Records SQL statements executed while active."""
+    
+    # Transaction bookkeeping emitted by the savepoint-per-test fixture
+    IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+    
+    def __init__(self):
+        self.statements = []
+        self.active = False
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def __enter__(self):
+        self.statements = []
+        self.active = True
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.active = False
+    
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not statement.lstrip().upper().startswith(self.IGNORED_PREFIXES):
+            self.statements.append(statement)
+
+
+@pytest.fixture(scope="function")
+def capquery(engine):
+    """Count queries issued inside a `with capquery:` block to catch N+1 regressions."""
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter.record)
+    
+    yield counter
+    
+    event.remove(engine, "before_cursor_execute", counter.record)
+
+
+@pytest.fixture(scope="function")
+def test_app(patched_get_db):
+    """Create test Flask app."""
+    app = create_app()
+    app.config['TESTING'] = True
     
     return app
 
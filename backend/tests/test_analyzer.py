@@ -92,7 +92,7 @@ def test_analyze_position(test_db, sample_loser_trader, mock_hyperliquid_api):
     assert float(opportunity.confidence_score) >= 70
 
 
-def test_analyze_new_positions(test_db, sample_loser_trader, mock_hyperliquid_api):
+def test_analyze_new_positions(test_db, patched_get_db, sample_loser_trader, mock_hyperliquid_api, capquery):
     """Test analyzing new positions and generating opportunities."""
     analyzer = TradingAnalyzer()
     
@@ -121,28 +121,22 @@ def test_analyze_new_positions(test_db, sample_loser_trader, mock_hyperliquid_ap
         test_db.add(pos)
     test_db.commit()
     
-    # Need to use contextmanager for get_db in analyzer
-    with test_db.bind.begin() as conn:
-        # Patch get_db to return our test session
-        import backend.database.connection
-        original_get_db = backend.database.connection.get_db
-        
-        def mock_get_db():
-            yield test_db
-        
-        backend.database.connection.get_db = mock_get_db
-        
-        try:
-            # Analyze positions
-            opportunities = analyzer.analyze_new_positions()
-            
-            assert len(opportunities) == 2
-            assert opportunities[0].coin == "BTC"
-            assert opportunities[0].suggested_side == "SHORT"
-            assert opportunities[1].coin == "ETH"
-            assert opportunities[1].suggested_side == "LONG"
-        finally:
-            backend.database.connection.get_db = original_get_db
+    # Analyze positions
+    with capquery:
+        opportunities = analyzer.analyze_new_positions()
+    
+    assert len(opportunities) == 2
+    assert opportunities[0].coin == "BTC"
+    assert opportunities[0].suggested_side == "SHORT"
+    assert opportunities[1].coin == "ETH"
+    assert opportunities[1].suggested_side == "LONG"
+    
+    # Existing opportunities are looked up once, not once per position
+    lookups = [s for s in capquery.statements if s.startswith("SELECT trade_opportunities.position_id")]
+    assert len(lookups) == 1
+    
+    # A second pass finds every position already analyzed
+    assert analyzer.analyze_new_positions() == []
 
 
 def test_get_active_opportunities(test_db, sample_trader, sample_position):
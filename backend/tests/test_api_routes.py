@@ -31,6 +31,16 @@ def test_get_top_losers_with_limit(test_client):
     assert data["status"] == "success"
 
 
+def test_json_response_matches_jsonify(test_app):
+    """orjson responses keep jsonify's formats for dates and Decimals."""
+    from flask import jsonify
+    from backend.api.routes import _json_response
+    
+    payload = {"last_updated": datetime(2024, 1, 2, 3, 4, 5), "pnl": Decimal("-85.5")}
+    with test_app.app_context():
+        assert json.loads(_json_response(payload).data) == json.loads(jsonify(payload).data)
+
+
 def test_get_opportunities_empty(test_client):
     """Test getting opportunities with no data."""
     response = test_client.get("/api/opportunities")
@@ -76,14 +86,18 @@ def test_get_trader_details_not_found(test_client):
     assert "not found" in data["message"]
 
 
-def test_get_trader_details_with_data(test_client, test_db, sample_loser_trader, sample_position):
+def test_get_trader_details_with_data(test_client, test_db, sample_loser_trader, sample_position, capquery):
     """Test getting trader details with data."""
     # Update position to belong to loser trader
     sample_position.trader_id = sample_loser_trader.id
     test_db.commit()
+    address = sample_loser_trader.address
     
-    response = test_client.get(f"/api/trader/{sample_loser_trader.address}")
+    with capquery:
+        response = test_client.get(f"/api/trader/{address}")
     assert response.status_code == 200
+    # Trader, performance history and open positions - no per-row lazy loads
+    assert capquery.count <= 3
     data = json.loads(response.data)
     assert data["status"] == "success"
     assert data["data"]["trader"]["address"] == sample_loser_trader.address
@@ -41,6 +41,20 @@ def test_get_or_create_trader_existing(test_db, sample_trader):
     assert trader.address == sample_trader.address
 
 
+def test_ensure_traders(test_db, sample_trader, mock_hyperliquid_api):
+    """Test bulk registering traders skips existing and duplicate addresses."""
+    collector = DataCollector()
+    
+    collector._ensure_traders(test_db, [sample_trader.address, "0xnew1", "0xnew2", "0xnew1"])
+    test_db.commit()
+    
+    assert test_db.query(Trader).count() == 3
+    new_trader = test_db.query(Trader).filter_by(address="0xnew1").one()
+    assert new_trader.is_active is True
+    assert new_trader.first_seen is not None
+    assert new_trader.short_address == "0xnew1...new1"
+
+
 def test_update_trader_performance(test_db, sample_trader, mock_hyperliquid_api):
     """Test updating trader performance."""
     collector = DataCollector()
@@ -82,6 +96,59 @@ def test_update_trader_positions(test_db, sample_trader, mock_hyperliquid_api):
     assert float(positions[0].size) == 1.0
 
 
+def test_calculate_performance_from_positions(test_db, sample_trader, mock_hyperliquid_api):
+    """Test performance aggregation over recent positions."""
+    collector = DataCollector()
+    
+    # No positions yet
+    performance = collector._calculate_performance_from_positions(test_db, sample_trader)
+    assert performance["total_trades"] == 0
+    
+    # Open positions only - metrics come from unrealized PnL
+    for coin, pnl in [("BTC", "500"), ("ETH", "-200"), ("SOL", None)]:
+        test_db.add(Position(
+            trader_id=sample_trader.id,
+            coin=coin,
+            side="LONG",
+            entry_price=Decimal("100"),
+            size=Decimal("1"),
+            unrealized_pnl=Decimal(pnl) if pnl else None,
+            opened_at=datetime.utcnow(),
+            status="OPEN"
+        ))
+    test_db.commit()
+    
+    performance = collector._calculate_performance_from_positions(test_db, sample_trader)
+    assert performance["total_trades"] == 3
+    assert performance["winning_trades"] == 1
+    assert performance["losing_trades"] == 1
+    assert performance["pnl_absolute"] == 300.0
+    assert performance["avg_win"] == 500.0
+    assert performance["avg_loss"] == -200.0
+    assert round(performance["win_rate"], 2) == 33.33
+    
+    # Once a position closes, metrics come from realized PnL
+    test_db.add(Position(
+        trader_id=sample_trader.id,
+        coin="DOGE",
+        side="SHORT",
+        entry_price=Decimal("1"),
+        size=Decimal("10"),
+        realized_pnl=Decimal("-50"),
+        opened_at=datetime.utcnow(),
+        status="CLOSED"
+    ))
+    test_db.commit()
+    
+    performance = collector._calculate_performance_from_positions(test_db, sample_trader)
+    assert performance["total_trades"] == 4
+    assert performance["winning_trades"] == 0
+    assert performance["losing_trades"] == 1
+    assert performance["pnl_absolute"] == -50.0
+    assert performance["avg_loss"] == -50.0
+    assert performance["win_rate"] == 0
+
+
 def test_collect_trader_data(test_db, mock_hyperliquid_api):
     """Test collecting all data for a trader."""
     collector = DataCollector()
@@ -104,14 +171,18 @@ def test_collect_trader_data(test_db, mock_hyperliquid_api):
     assert len(positions) == 1
 
 
-def test_collect_multiple_traders(test_db, mock_hyperliquid_api):
+def test_collect_multiple_traders(test_db, patched_get_db, mock_hyperliquid_api, capquery):
     """Test collecting data for multiple traders."""
     collector = DataCollector()
     
     addresses = ["0xtest1", "0xtest2", "0xtest3"]
-    results = collector.collect_multiple_traders(addresses)
+    with capquery:
+        results = collector.collect_multiple_traders(addresses)
     
     assert len(results) == 3
+    # New traders are registered with one bulk INSERT, not one per address
+    trader_inserts = [s for s in capquery.statements if s.startswith("INSERT INTO traders")]
+    assert len(trader_inserts) == 1
     assert all(results.values())  # All should succeed
     
     # Verify all traders were created
@@ -120,6 +191,45 @@ def test_collect_multiple_traders(test_db, mock_hyperliquid_api):
         assert trader is not None
 
 
+def test_collect_multiple_traders_batch(test_db, patched_get_db, mock_hyperliquid_api, monkeypatch):
+    """Test that batch collection commits the whole cycle once."""
+    collector = DataCollector()
+    
+    commits = []
+    original_commit = test_db.commit
+    monkeypatch.setattr(test_db, "commit", lambda: commits.append(1) or original_commit())
+    
+    addresses = ["0xtest1", "0xtest2", "0xtest3"]
+    results = collector.collect_multiple_traders(addresses, batch=True)
+    
+    assert results == {address: True for address in addresses}
+    assert len(commits) == 1
+    
+    for address in addresses:
+        trader = test_db.query(Trader).filter_by(address=address).one()
+        assert test_db.query(Position).filter_by(trader_id=trader.id).count() == 1
+
+
+def test_collect_multiple_traders_batch_isolates_failures(test_db, patched_get_db, mock_hyperliquid_api):
+    """Test that one failing trader doesn't roll back the rest of the batch."""
+    collector = DataCollector()
+    original = collector._update_trader_positions
+    
+    def flaky_update(db, trader):
+        if trader.address == "0xbad":
+            raise RuntimeError("boom")
+        original(db, trader)
+    
+    collector._update_trader_positions = flaky_update
+    results = collector.collect_multiple_traders(["0xgood", "0xbad"], batch=True)
+    
+    assert results == {"0xgood": True, "0xbad": False}
+    good = test_db.query(Trader).filter_by(address="0xgood").one()
+    bad = test_db.query(Trader).filter_by(address="0xbad").one()
+    assert test_db.query(TraderPerformance).filter_by(trader_id=good.id).count() == 1
+    assert test_db.query(TraderPerformance).filter_by(trader_id=bad.id).count() == 0
+
+
 def test_get_top_losers_empty(test_db):
     """Test getting top losers with no data."""
     collector = DataCollector()
@@ -129,37 +239,26 @@ def test_get_top_losers_empty(test_db):
     assert len(losers) == 0
 
 
-def test_get_top_losers_with_data(test_db, sample_loser_trader):
+def test_get_top_losers_with_data(test_db, patched_get_db, sample_loser_trader, mock_hyperliquid_api, capquery):
     """Test getting top losers with data."""
     collector = DataCollector()
     
-    # Need to create the view manually for SQLite
-    test_db.execute("""
-        CREATE VIEW v_top_losers AS
-        SELECT 
-            t.id,
-            t.address,
-            AVG(tp.pnl_percentage) as avg_pnl_percentage,
-            SUM(tp.pnl_absolute) as total_pnl,
-            AVG(tp.win_rate) as avg_win_rate,
-            SUM(tp.total_trades) as total_trades,
-            1 as loss_rank
-        FROM traders t
-        JOIN trader_performance tp ON t.id = tp.trader_id
-        WHERE tp.date >= date('now', '-30 days')
-        GROUP BY t.id, t.address
-        HAVING AVG(tp.pnl_percentage) < 0
-        ORDER BY AVG(tp.pnl_percentage) ASC
-        LIMIT 500
-    """)
+    # Only today's snapshot clears the account value threshold
+    today_perf = test_db.query(TraderPerformance).filter_by(
+        trader_id=sample_loser_trader.id, date=date.today()
+    ).one()
+    today_perf.account_value = Decimal("50000")
     test_db.commit()
     
-    losers = collector.get_top_losers(limit=10)
+    with capquery:
+        losers = collector.get_top_losers(limit=10)
     
+    # One query for the whole list; 7d PnL comes from the API, not the database
+    assert capquery.count == 1
     assert isinstance(losers, list)
     assert len(losers) == 1
     assert losers[0]["address"] == sample_loser_trader.address
-    assert losers[0]["pnl_percentage"] == -85.5
+    assert losers[0]["roi_30d_percent"] == -85.5
     assert losers[0]["win_rate"] == 15.0
 
 
@@ -1,6 +1,6 @@
 import pytest
 from decimal import Decimal
-from backend.services.hyperliquid_api import HyperliquidAPI
+from backend.services.hyperliquid_api import HyperliquidAPI, get_api
 
 
 def test_hyperliquid_api_init(mock_hyperliquid_api):
@@ -10,6 +10,17 @@ def test_hyperliquid_api_init(mock_hyperliquid_api):
     assert hasattr(api, 'info')
 
 
+def test_get_api_reuses_instance(mock_hyperliquid_api):
+    """Test that get_api hands out a single shared client."""
+    get_api.cache_clear()
+    try:
+        api = get_api()
+        assert isinstance(api, HyperliquidAPI)
+        assert get_api() is api
+    finally:
+        get_api.cache_clear()
+
+
 def test_get_user_state(mock_hyperliquid_api):
     """Test getting user state."""
     api = HyperliquidAPI()
@@ -85,4 +96,8 @@ def test_empty_performance_metrics(mock_hyperliquid_api):
     assert empty_metrics["win_rate"] == 0.0
     assert empty_metrics["total_trades"] == 0
     assert empty_metrics["winning_trades"] == 0
-    assert empty_metrics["losing_trades"] == 0
\ No newline at end of file
+    assert empty_metrics["losing_trades"] == 0
+    
+    # Each call returns an independent copy of the template
+    empty_metrics["total_trades"] = 5
+    assert api._empty_performance_metrics()["total_trades"] == 0
\ No newline at end of file
@@ -0,0 +1,155 @@
+import pytest
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from backend.database.bulk import REFRESHED_PERFORMANCE_COLUMNS, table_counts
+from backend.database.validation import check_row, numeric_str, position_row
+from backend.models import Position, TradeOpportunity, Trader
+from scripts import populate_db_once
+
+
+@pytest.fixture
+def unmargined_position():
+    """An open position as returned by get_open_positions() with no margin data."""
+    return {
+        "coin": "BTC",
+        "side": "LONG",
+        "entry_price": 45000.0,
+        "size": 0.5,
+        "leverage": 10,
+        "position_value": 22500.0,
+        "unrealized_pnl": -1250.0,
+        "margin_used": None,
+        "liquidation_price": None,
+    }
+
+
+def test_numeric_str():
+    """NUMERIC values are passed as strings, and missing ones as NULL."""
+    assert numeric_str(1.5) == "1.5"
+    assert numeric_str(0) == "0"
+    assert numeric_str(None) is None
+
+
+def test_position_row_keeps_missing_values_null(unmargined_position):
+    """Missing NUMERIC values are sent as NULL rather than the string 'None'."""
+    row = position_row(1, unmargined_position, datetime.utcnow())
+
+    assert row["liquidation_price"] is None
+    assert row["margin_used"] is None
+    assert row["entry_price"] == "45000.0"
+    assert row["size"] == "0.5"
+    assert "None" not in row.values()
+
+
+@pytest.mark.parametrize("field, value", [
+    ("entry_price", None),
+    ("liquidation_price", "abc"),
+    ("position_value", float("nan")),
+    ("leverage", 1000),
+])
+def test_position_row_rejects_invalid_values(field, value, unmargined_position):
+    """Values the database would reject raise before the row is queued."""
+    unmargined_position[field] = value
+
+    with pytest.raises(ValueError, match=field):
+        position_row(1, unmargined_position, datetime.utcnow())
+
+
+def test_check_row_rejects_long_strings():
+    """Strings longer than their column raise ValueError."""
+    row = {"trader_id": 1, "coin": "X" * 21, "side": "LONG"}
+
+    with pytest.raises(ValueError, match="coin"):
+        check_row(Position.__table__, row)
+
+
+def test_table_counts(test_db, sample_position, capquery):
+    """Row counts for several tables come back from a single query."""
+    with capquery:
+        counts = table_counts(test_db, Trader, Position, TradeOpportunity)
+
+    assert counts == (1, 1, 0)
+    assert capquery.count == 1
+
+
+class RecordingCursor:
+    """DB-API cursor stand-in that records the SQL and COPY data it receives."""
+
+    rowcount = 2
+
+    def __init__(self):
+        self.statements = []
+        self.copied = None
+
+    def execute(self, sql):
+        self.statements.append(sql)
+
+    def copy_expert(self, sql, buffer):
+        self.statements.append(sql)
+        self.copied = buffer.read()
+
+
+def test_copy_rows_stages_only_copied_columns():
+    """The staging table has just the copied columns, so the id sequence is untouched."""
+    cursor = RecordingCursor()
+
+    count = populate_db_once.copy_rows(
+        cursor, "positions", ("trader_id", "coin", "liquidation_price"),
+        [(1, "BTC", None), (2, "ETH", 1500.5)], "(trader_id, coin, side) WHERE status = 'OPEN'"
+    )
+
+    create, copy, insert = cursor.statements
+    assert count == 2
+    assert "LIKE" not in create
+    assert "AS SELECT trader_id, coin, liquidation_price FROM positions WITH NO DATA" in create
+    assert copy.startswith("COPY positions_stage (trader_id, coin, liquidation_price)")
+    assert cursor.copied.splitlines() == ["1,BTC,", "2,ETH,1500.5"]
+    assert insert.endswith("ON CONFLICT (trader_id, coin, side) WHERE status = 'OPEN' DO NOTHING")
+
+
+def test_copy_rows_refreshes_update_columns():
+    """Conflicting rows have the given columns replaced with the copied values."""
+    cursor = RecordingCursor()
+
+    populate_db_once.copy_rows(
+        cursor, "trader_performance", populate_db_once.PERFORMANCE_COLUMNS, [],
+        "(trader_id, date)", ("pnl_percentage", "account_value")
+    )
+
+    assert cursor.statements[-1].endswith(
+        "ON CONFLICT (trader_id, date) DO UPDATE SET "
+        "pnl_percentage = EXCLUDED.pnl_percentage, account_value = EXCLUDED.account_value"
+    )
+
+
+def test_bulk_copy_refreshes_todays_performance(test_db, monkeypatch):
+    """bulk_copy sends one performance row per trader and refreshes its metrics on rerun."""
+    @contextmanager
+    def mock_get_db():
+        yield test_db
+
+    calls = {}
+
+    def record_copy_rows(cursor, table, columns, rows, conflict_target, update_columns=()):
+        calls[table] = (rows, conflict_target, update_columns)
+        return len(rows)
+
+    monkeypatch.setattr(populate_db_once, "get_db", mock_get_db)
+    monkeypatch.setattr(populate_db_once, "copy_rows", record_copy_rows)
+
+    trader = {
+        "address": "0xbulk", "roi_30d_percent": -95.0, "pnl_30d": -1000.0, "account_value": 2000.0,
+        "positions": [{"coin": "BTC", "side": "LONG", "entry_price": 50000.0, "size": 0.1}]
+    }
+    populate_db_once.bulk_copy([trader, dict(trader, roi_30d_percent=-96.0)])
+
+    trader_id = test_db.query(Trader).filter_by(address="0xbulk").one().id
+    performance_rows, conflict_target, update_columns = calls["trader_performance"]
+    assert performance_rows == [(trader_id, date.today(), -96.0, -1000.0, 2000.0)]
+    assert conflict_target == "(trader_id, date)"
+    assert update_columns == REFRESHED_PERFORMANCE_COLUMNS
+
+    position_rows, _, update_columns = calls["positions"]
+    assert [row[:3] for row in position_rows] == [(trader_id, "BTC", "LONG")] * 2
+    assert update_columns == ()
@@ -1,6 +1,8 @@
 import pytest
 from datetime import datetime
 from decimal import Decimal
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from backend.models import Trader, TraderPerformance, Position, TradeOpportunity
 
 
@@ -58,6 +60,28 @@ def test_position_model(test_db, sample_trader):
     assert position.status == "OPEN"
 
 
+def test_one_open_position_per_coin_and_side(test_db, sample_trader):
+    """Test that duplicate open positions are rejected but closed ones are kept."""
+    def make_position(status):
+        return Position(
+            trader_id=sample_trader.id,
+            coin="BTC",
+            side="LONG",
+            entry_price=Decimal("50000"),
+            size=Decimal("1.0"),
+            opened_at=datetime.utcnow(),
+            status=status
+        )
+    
+    test_db.add_all([make_position("OPEN"), make_position("CLOSED"), make_position("CLOSED")])
+    test_db.commit()
+    
+    test_db.add(make_position("OPEN"))
+    with pytest.raises(IntegrityError):
+        test_db.commit()
+    test_db.rollback()
+
+
 def test_trade_opportunity_model(test_db, sample_trader, sample_position):
     """Test TradeOpportunity model."""
     opportunity = TradeOpportunity(
@@ -77,6 +101,29 @@ def test_trade_opportunity_model(test_db, sample_trader, sample_position):
     assert float(opportunity.confidence_score) == 85.5
 
 
+def test_trade_opportunity_as_dict(test_db, sample_trader, sample_position):
+    """Test TradeOpportunity serialization to plain values."""
+    opportunity = TradeOpportunity(
+        position_id=sample_position.id,
+        trader_id=sample_trader.id,
+        coin="BTC",
+        loser_side="LONG",
+        suggested_side="SHORT",
+        loser_entry_price=Decimal("50000"),
+        confidence_score=Decimal("85.5"),
+        status="ACTIVE"
+    )
+    test_db.add(opportunity)
+    test_db.commit()
+    
+    data = opportunity.as_dict()
+    assert data["coin"] == "BTC"
+    assert data["loser_entry_price"] == 50000.0
+    assert data["suggested_entry_price"] is None
+    assert data["confidence_score"] == 85.5
+    assert isinstance(data["created_at"], str)
+
+
 def test_model_relationships(test_db, sample_trader):
     """Test model relationships."""
     # Add performance record
@@ -105,4 +152,30 @@ def test_model_relationships(test_db, sample_trader):
     assert len(sample_trader.performance_history) == 1
     assert len(sample_trader.positions) == 1
     assert sample_trader.performance_history[0].pnl_percentage == Decimal("-50")
-    assert sample_trader.positions[0].coin == "ETH"
\ No newline at end of file
+    assert sample_trader.positions[0].coin == "ETH"
+
+
+@pytest.mark.parametrize("query,index_name", [
+    (
+        "SELECT * FROM positions WHERE trader_id = 1 AND status = 'OPEN'",
+        "idx_positions_trader_id_status"
+    ),
+    (
+        "SELECT * FROM trade_opportunities WHERE status = 'ACTIVE'",
+        "idx_trade_opportunities_status"
+    ),
+    (
+        "SELECT * FROM trader_performance WHERE trader_id = 1 AND date >= date('now', '-30 days')",
+        "idx_trader_performance_trader_id_date"
+    ),
+    (
+        "SELECT * FROM trader_performance WHERE pnl_percentage < 0 AND account_value > 10000 "
+        "ORDER BY pnl_percentage ASC LIMIT 10",
+        "idx_trader_performance_losers"
+    ),
+])
+def test_hot_queries_use_indexes(test_db, query, index_name):
+    """Test that hot query filters are served by an index, not a full scan."""
+    plan = " ".join(row[-1] for row in test_db.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+    
+    assert f"USING INDEX {index_name}" in plan
@@ -24,7 +24,7 @@ loglevel = "info"
 proc_name = 'hyperliquid-api'
 
 # Server mechanics
-preload_app = True
+preload_app = True  # Import the app and initialize the database once in the master
 daemon = False
 pidfile = None
 tmp_upload_dir = None
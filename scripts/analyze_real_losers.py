@@ -5,17 +5,27 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import json
-from backend.services import HyperliquidAPI
+from pathlib import Path
+import msgpack
+import orjson
+from backend.services import get_api
 
 
-def find_bottom_traders():
-    """Find the worst performing traders from leaderboard data."""
-    print("\n=== Analyzing Hyperliquid Leaderboard for Worst Traders ===\n")
+LEADERBOARD_JSON = "leaderboard_data.json"
+LEADERBOARD_CACHE = Path("leaderboard.msgpack")
+
+
+def load_traders():
+    """Load normalized trader performance, reusing the msgpack cache when fresh."""
+    if (LEADERBOARD_CACHE.exists() and
+            LEADERBOARD_CACHE.stat().st_mtime >= os.path.getmtime(LEADERBOARD_JSON)):
+        traders = msgpack.unpackb(LEADERBOARD_CACHE.read_bytes(), raw=False)
+        print(f"Loaded {len(traders)} traders from {LEADERBOARD_CACHE}")
+        return traders
     
     # Load leaderboard data
-    with open("leaderboard_data.json", "r") as f:
-        data = json.load(f)
+    with open(LEADERBOARD_JSON, "rb") as f:
+        data = orjson.loads(f.read())
     
     leaderboard = data.get("leaderboardRows", [])
     print(f"Found {len(leaderboard)} traders on leaderboard")
@@ -28,11 +38,7 @@ def find_bottom_traders():
         account_value = float(row.get("accountValue", 0))
         
         # Get 30-day (month) performance
-        month_perf = None
-        for window in row.get("windowPerformances", []):
-            if window[0] == "month":
-                month_perf = window[1]
-                break
+        month_perf = dict(row.get("windowPerformances", ())).get("month")
         
         if month_perf:
             pnl = float(month_perf.get("pnl", 0))
@@ -48,6 +54,18 @@ def find_bottom_traders():
                 "volume_30d": float(month_perf.get("vlm", 0))
             })
     
+    # Cache the normalized list so later runs skip JSON parsing
+    LEADERBOARD_CACHE.write_bytes(msgpack.packb(traders))
+    
+    return traders
+
+
+def find_bottom_traders():
+    """Find the worst performing traders from leaderboard data."""
+    print("\n=== Analyzing Hyperliquid Leaderboard for Worst Traders ===\n")
+    
+    traders = load_traders()
+    
     # Sort by ROI (worst first)
     traders.sort(key=lambda x: x["roi_30d_percent"])
     
@@ -70,7 +88,7 @@ def find_bottom_traders():
     print("CHECKING CURRENT POSITIONS FOR COUNTER-TRADING")
     print("="*80)
     
-    api = HyperliquidAPI()
+    api = get_api()
     opportunities = []
     
     for trader in bottom_5:
@@ -136,8 +154,8 @@ if __name__ == "__main__":
             "counter_trade_opportunities": opportunities
         }
         
-        with open("analysis_results.json", "w") as f:
-            json.dump(results, f, indent=2)
+        with open("analysis_results.json", "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         
         print("\n✓ Analysis complete! Results saved to analysis_results.json")
         
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""One-off migration: close duplicate open positions, then apply the schema.
+
+Databases created before the unique index on open positions can hold
+several OPEN rows per trader, coin and side, and init_db() can't build the
+index until they are gone. This closes all but the newest of each group.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from backend.database.connection import engine, init_db, test_connection
+
+CLOSE_DUPLICATES_SQL = """
+UPDATE positions p SET status = 'CLOSED', closed_at = CURRENT_TIMESTAMP
+WHERE p.status = 'OPEN' AND EXISTS (
+    SELECT 1 FROM positions q
+    WHERE q.trader_id = p.trader_id AND q.coin = p.coin AND q.side = p.side
+      AND q.status = 'OPEN' AND q.id > p.id
+)
+"""
+
+
+def main():
+    """Close duplicate open positions and build the unique index."""
+    if not test_connection():
+        print("Failed to connect to database!")
+        return 1
+
+    with engine.begin() as conn:
+        closed = conn.execute(text(CLOSE_DUPLICATES_SQL)).rowcount
+    print(f"Closed {closed} duplicate open positions")
+
+    init_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
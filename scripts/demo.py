@@ -5,21 +5,35 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.services import HyperliquidAPI, DataCollector
+from backend.services import get_api, DataCollector
 from backend.database.connection import init_db, test_connection
 import logging
+import numpy as np
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Below this many traders a plain sort is cheaper than building arrays
+NUMPY_MIN_TRADERS = 100
+
+
+def worst_traders(traders_data, count=5):
+    """Return the traders with the lowest 30-day PnL, worst first."""
+    if len(traders_data) < NUMPY_MIN_TRADERS:
+        return sorted(traders_data, key=lambda x: x["pnl_30d"])[:count]
+    
+    pnl = np.fromiter((t["pnl_30d"] for t in traders_data), dtype=np.float64, count=len(traders_data))
+    # Stable argsort keeps the same tie order as sorted()
+    return [traders_data[i] for i in np.argsort(pnl, kind="stable")[:count]]
+
 
 def demo_find_losers():
     """Demonstrate finding bottom traders using Hyperliquid API."""
     print("\n=== Hyperliquid Counter-Trading System Demo ===\n")
     
     # Initialize API
-    api = HyperliquidAPI()
+    api = get_api()
     print("✓ Connected to Hyperliquid API (Mainnet)")
     
     # Some known addresses to demo (these are examples - replace with real addresses)
@@ -78,13 +92,13 @@ def demo_find_losers():
                 print(f"     • {pos['side']} {pos['size']} {pos['coin']} @ ${float(pos['entry_price']):,.2f}")
     
     # Sort by PnL (worst first)
-    traders_data.sort(key=lambda x: x["pnl_30d"])
+    bottom_traders = worst_traders(traders_data)
     
     print("\n" + "=" * 80)
     print("BOTTOM 5 TRADERS (30-Day Performance)")
     print("=" * 80)
     
-    for i, trader in enumerate(traders_data[:5], 1):
+    for i, trader in enumerate(bottom_traders, 1):
         print(f"\n#{i} Trader: {trader['address'][:10]}...{trader['address'][-6:]}")
         print(f"   Loss: {trader['pnl_30d']:+.2f}% | Win Rate: {trader['win_rate']:.1f}% | Trades: {trader['total_trades']}")
         
@@ -99,7 +113,7 @@ def demo_find_losers():
     print("=" * 80)
     
     opportunities = []
-    for trader in traders_data[:5]:
+    for trader in bottom_traders:
         for pos in trader.get('positions', []):
             opposite = "SHORT" if pos['side'] == "LONG" else "LONG"
             opportunities.append({
@@ -122,7 +136,7 @@ def demo_with_real_data():
     """Demo with real trader addresses if available."""
     print("\n=== LIVE DEMO - Fetching Real Hyperliquid Data ===\n")
     
-    api = HyperliquidAPI()
+    api = get_api()
     
     # Try to get some real addresses from the exchange
     # Note: You'd need actual trader addresses from the leaderboard
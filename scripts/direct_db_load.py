@@ -3,147 +3,163 @@
 
 import sys
 import os
-from decimal import Decimal
+import heapq
+import ijson
 from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import insert
+from backend.database.bulk import (
+    bulk_connection, insert_open_positions, table_counts, upsert_performance, upsert_traders
+)
 from backend.database.connection import get_db
+from backend.database.validation import check_row, numeric_str, position_row
 from backend.models import Trader, TraderPerformance, Position, TradeOpportunity
-from backend.services.hyperliquid_api import HyperliquidAPI
+from backend.services import get_api
+
+LEADERBOARD_FILE = 'leaderboard_data.json'
+OPPOSITE_SIDE = {'LONG': 'SHORT', 'SHORT': 'LONG'}
+
+def load_leaderboard(path=LEADERBOARD_FILE):
+    """Stream leaderboard rows saved by find_real_traders.py into trader dicts with 30-day figures."""
+    leaderboard = []
+    with open(path, 'rb') as f:
+        for row in ijson.items(f, 'leaderboardRows.item'):
+            month_perf = dict(row.get('windowPerformances', ())).get('month')
+            if month_perf:
+                leaderboard.append({
+                    'address': row.get('ethAddress'),
+                    'accountValue': float(row.get('accountValue', 0)),
+                    'pnl30dPercent': float(month_perf.get('roi', 0)) * 100,
+                    'pnl30d': float(month_perf.get('pnl', 0))
+                })
+    return leaderboard
 
 def main():
     """Load live data directly into database."""
     print("Loading live Hyperliquid data into database...")
     
-    api = HyperliquidAPI()
+    api = get_api()
     
-    # Get leaderboard data (this is the working call from find_active_losers.py)
-    print("Fetching leaderboard data...")
-    leaderboard = api.get_leaderboard()
+    # The API has no leaderboard call, so read the snapshot find_real_traders.py saves
+    if not os.path.exists(LEADERBOARD_FILE):
+        print(f"Error: {LEADERBOARD_FILE} not found. Run find_real_traders.py first.")
+        return
+    
+    print("Loading leaderboard data...")
+    leaderboard = load_leaderboard()
     if not leaderboard:
-        print("Failed to fetch leaderboard data")
+        print("No leaderboard data found")
         return
     
     print(f"Got {len(leaderboard)} traders from leaderboard")
     
-    # Filter for losing traders with >$1000 capital
-    losing_traders = []
-    for trader in leaderboard:
-        roi = trader.get('accountValue', 0)
-        pnl_30d = trader.get('pnl30dPercent', 0)
-        
-        if roi > 1000 and pnl_30d < -10:  # More than $1k and >10% loss
-            losing_traders.append(trader)
+    # Filter for losing traders with >$1000 capital and >10% loss
+    losing_traders = [
+        trader for trader in leaderboard
+        if trader.get('accountValue', 0) > 1000 and trader.get('pnl30dPercent', 0) < -10
+    ]
     
     print(f"Found {len(losing_traders)} losing traders with >$1000 capital")
     
     # Take top 20 worst performers for testing
-    losing_traders.sort(key=lambda x: x.get('pnl30dPercent', 0))
-    test_traders = losing_traders[:20]
+    test_traders = heapq.nsmallest(20, losing_traders, key=lambda x: x.get('pnl30dPercent', 0))
     
     print(f"Processing top {len(test_traders)} worst performers...")
     
+    addresses = list(dict.fromkeys(trader_data['address'] for trader_data in test_traders))
+    
+    # Fetch every trader's positions concurrently before touching the database
+    print("Fetching open positions...")
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        positions_by_address = dict(zip(addresses, executor.map(api.get_open_positions, addresses)))
+    
+    # One timestamp for the whole batch
+    now = datetime.utcnow()
+    today = date.today()
+    
     with get_db() as db:
+        conn = bulk_connection(db)
+        trader_ids = upsert_traders(conn, addresses, now)
+        
+        # Keyed by their unique columns so each row is sent once; NUMERIC values
+        # are passed as strings and cast by Postgres rather than built as Decimals
+        perf_rows = {}
+        position_rows = {}
+        confidence_by_trader = {}
+        
         for i, trader_data in enumerate(test_traders):
             address = trader_data['address']
             print(f"Processing trader {i+1}/{len(test_traders)}: {address[:10]}...")
             
             try:
-                # Create trader
-                trader = db.query(Trader).filter_by(address=address).first()
-                if not trader:
-                    trader = Trader(
-                        address=address,
-                        first_seen=datetime.utcnow(),
-                        last_updated=datetime.utcnow(),
-                        is_active=True
-                    )
-                    db.add(trader)
-                    db.flush()
+                trader_id = trader_ids[address]
+                trader_positions = {}
                 
-                # Add performance
-                today = date.today()
-                existing_perf = db.query(TraderPerformance).filter_by(
-                    trader_id=trader.id,
-                    date=today
-                ).first()
+                # Positions were fetched up front
+                positions = positions_by_address[address]
                 
-                if not existing_perf:
-                    perf = TraderPerformance(
-                        trader_id=trader.id,
-                        date=today,
-                        pnl_percentage=Decimal(str(trader_data.get('pnl30dPercent', 0))),
-                        pnl_absolute=Decimal(str(trader_data.get('pnl30d', 0))),
-                        account_value=Decimal(str(trader_data.get('accountValue', 0))),
-                        win_rate=Decimal('0'),
-                        total_trades=0,
-                        winning_trades=0,
-                        losing_trades=0,
-                        avg_win=Decimal('0'),
-                        avg_loss=Decimal('0')
-                    )
-                    db.add(perf)
+                for pos_data in positions:
+                    # Opportunities are built from these rows after the insert,
+                    # so reject sides that can't be inverted up front
+                    if pos_data['side'] not in OPPOSITE_SIDE:
+                        raise ValueError(f"unknown side {pos_data['side']!r}")
+                    key = (trader_id, pos_data['coin'], pos_data['side'])
+                    trader_positions[key] = position_row(trader_id, pos_data, now)
                 
-                # Get positions for this trader
-                positions = api.get_open_positions(address)
-                position_count = 0
+                # Add performance
+                trader_perf = check_row(TraderPerformance.__table__, {
+                    'trader_id': trader_id,
+                    'date': today,
+                    'pnl_percentage': numeric_str(trader_data.get('pnl30dPercent', 0)),
+                    'pnl_absolute': numeric_str(trader_data.get('pnl30d', 0)),
+                    'account_value': numeric_str(trader_data.get('accountValue', 0)),
+                    'win_rate': '0',
+                    'total_trades': 0,
+                    'winning_trades': 0,
+                    'losing_trades': 0,
+                    'avg_win': '0',
+                    'avg_loss': '0'
+                })
                 
-                for pos_data in positions:
-                    existing_pos = db.query(Position).filter_by(
-                        trader_id=trader.id,
-                        coin=pos_data['coin'],
-                        side=pos_data['side'],
-                        status='OPEN'
-                    ).first()
-                    
-                    if not existing_pos:
-                        position = Position(
-                            trader_id=trader.id,
-                            coin=pos_data['coin'],
-                            side=pos_data['side'],
-                            entry_price=Decimal(str(pos_data['entryPx'])),
-                            size=Decimal(str(abs(pos_data['szi']))),
-                            leverage=Decimal(str(pos_data.get('leverage', 1))),
-                            position_value=Decimal(str(pos_data.get('positionValue', 0))),
-                            unrealized_pnl=Decimal(str(pos_data.get('unrealizedPnl', 0))),
-                            margin_used=Decimal(str(pos_data.get('marginUsed', 0))),
-                            liquidation_price=Decimal(str(pos_data.get('liquidationPx', 0))),
-                            opened_at=datetime.utcnow(),
-                            status='OPEN'
-                        )
-                        db.add(position)
-                        position_count += 1
-                        
-                        # Create opportunity
-                        suggested_side = 'SHORT' if pos_data['side'] == 'LONG' else 'LONG'
-                        confidence = 95 if trader_data.get('pnl30dPercent', 0) < -90 else 85
-                        
-                        opportunity = TradeOpportunity(
-                            trader_id=trader.id,
-                            coin=pos_data['coin'],
-                            loser_side=pos_data['side'],
-                            suggested_side=suggested_side,
-                            loser_entry_price=Decimal(str(pos_data['entryPx'])),
-                            suggested_entry_price=Decimal(str(pos_data['entryPx'])),
-                            confidence_score=Decimal(str(confidence)),
-                            status='ACTIVE'
-                        )
-                        db.add(opportunity)
+                # Every row for this trader is valid, so queue them together
+                perf_rows[trader_id] = trader_perf
+                position_rows.update(trader_positions)
                 
-                db.commit()
-                print(f"  ✓ Added {position_count} positions")
+                # Opportunity confidence depends only on the trader, not the position
+                confidence_by_trader[trader_id] = '95' if trader_data.get('pnl30dPercent', 0) < -90 else '85'
+                print(f"  ✓ Queued {len(trader_positions)} positions")
                 
             except Exception as e:
                 print(f"  ✗ Error: {e}")
-                db.rollback()
-    
-    # Check final counts
-    with get_db() as db:
-        trader_count = db.query(Trader).count()
-        position_count = db.query(Position).count()
-        opp_count = db.query(TradeOpportunity).count()
         
+        # Refresh today's metrics in place and skip positions that are already open
+        upsert_performance(conn, list(perf_rows.values()))
+        inserted = insert_open_positions(conn, list(position_rows.values()))
+        
+        # Build opportunities in one pass, only for positions that were actually inserted
+        new_opportunities = [
+            {
+                'position_id': inserted[key],
+                'trader_id': row['trader_id'],
+                'coin': row['coin'],
+                'loser_side': row['side'],
+                'suggested_side': OPPOSITE_SIDE[row['side']],
+                'loser_entry_price': row['entry_price'],
+                'suggested_entry_price': row['entry_price'],
+                'confidence_score': confidence_by_trader[row['trader_id']],
+                'status': 'ACTIVE'
+            }
+            for key, row in position_rows.items() if key in inserted
+        ]
+        if new_opportunities:
+            conn.execute(insert(TradeOpportunity.__table__), new_opportunities)
+        db.commit()
+        
+        trader_count, position_count, opp_count = table_counts(db, Trader, Position, TradeOpportunity)
+    
     print(f"\nDatabase loaded successfully!")
     print(f"  Traders: {trader_count}")
     print(f"  Positions: {position_count}")  
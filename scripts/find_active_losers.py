@@ -5,129 +5,198 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import json
-from backend.services import HyperliquidAPI
+import argparse
+import heapq
+import pickle
+from operator import attrgetter
+from typing import List, NamedTuple, Optional
+import ijson
+import orjson
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from backend.services import get_api
 
+LEADERBOARD_FILE = "leaderboard_data.json"
+CACHE_FILE = "leaderboard_data.pkl"
 
-def find_active_losers():
-    """Find traders with negative ROI who still have capital and positions."""
-    print("\n=== Finding Active Losing Traders ===\n")
+
+class Loser(NamedTuple):
+    """A losing trader kept from the leaderboard."""
+    address: str
+    name: str
+    account_value: float
+    roi_30d_percent: float
+    pnl_30d: float
+    volume_30d: float
+    positions: Optional[List[dict]] = None
+
+
+class Opportunity(NamedTuple):
+    """A suggested counter-trade against a losing trader's position."""
+    trader_name: str
+    trader_loss: float
+    coin: str
+    action: str
+    reason: str
+    confidence: float
+
+
+def _json_default(obj):
+    """Serialize Decimal position values that orjson doesn't handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def safe_get_positions(api, address):
+    """Get open positions, treating lookup failures as no positions."""
+    try:
+        return api.get_open_positions(address)
+    except Exception:
+        return []
+
+
+def parse_active_losers():
+    """Parse leaderboard rows into losing traders that still have capital."""
+    active_losers = []
     
-    # Load leaderboard data
-    with open("leaderboard_data.json", "r") as f:
-        data = json.load(f)
+    # Stream leaderboard rows so only the kept traders are held in memory
+    with open(LEADERBOARD_FILE, "rb") as f:
+        for row in ijson.items(f, "leaderboardRows.item"):
+            account_value = float(row.get("accountValue", 0))
+            
+            # Skip if account is empty
+            if account_value < 1000:  # At least $1000 to be worth tracking
+                continue
+            
+            # Get 30-day performance
+            month_perf = dict(row.get("windowPerformances", ())).get("month")
+            
+            if month_perf:
+                roi = float(month_perf.get("roi", 0))
+                roi_percent = roi * 100
+                
+                # Only interested in losers
+                if roi_percent < -10:  # At least -10% loss
+                    active_losers.append(Loser(
+                        address=row.get("ethAddress"),
+                        name=row.get("displayName", "Unknown"),
+                        account_value=account_value,
+                        roi_30d_percent=roi_percent,
+                        pnl_30d=float(month_perf.get("pnl", 0)),
+                        volume_30d=float(month_perf.get("vlm", 0))
+                    ))
     
-    leaderboard = data.get("leaderboardRows", [])
+    return active_losers
+
+
+def load_active_losers(use_cache=True):
+    """Load active losers, reusing the pickle cache while it's newer than the JSON."""
+    if use_cache and os.path.exists(CACHE_FILE) and \
+            os.path.getmtime(CACHE_FILE) >= os.path.getmtime(LEADERBOARD_FILE):
+        with open(CACHE_FILE, "rb") as f:
+            return list(map(Loser._make, pickle.load(f)))
     
-    # Find traders with negative ROI but positive account value
-    active_losers = []
+    # Cache plain tuples so the pickle doesn't depend on how this script was imported
+    active_losers = parse_active_losers()
+    with open(CACHE_FILE, "wb") as f:
+        pickle.dump([tuple(loser) for loser in active_losers], f, protocol=5)
+    return active_losers
+
+
+def find_active_losers(use_cache=True):
+    """Find traders with negative ROI who still have capital and positions."""
+    print("\n=== Finding Active Losing Traders ===\n")
     
-    for row in leaderboard:
-        account_value = float(row.get("accountValue", 0))
-        
-        # Skip if account is empty
-        if account_value < 1000:  # At least $1000 to be worth tracking
-            continue
-        
-        # Get 30-day performance
-        month_perf = None
-        for window in row.get("windowPerformances", []):
-            if window[0] == "month":
-                month_perf = window[1]
-                break
-        
-        if month_perf:
-            roi = float(month_perf.get("roi", 0))
-            roi_percent = roi * 100
-            
-            # Only interested in losers
-            if roi_percent < -10:  # At least -10% loss
-                active_losers.append({
-                    "address": row.get("ethAddress"),
-                    "name": row.get("displayName", "Unknown"),
-                    "account_value": account_value,
-                    "roi_30d_percent": roi_percent,
-                    "pnl_30d": float(month_perf.get("pnl", 0)),
-                    "volume_30d": float(month_perf.get("vlm", 0))
-                })
-    
-    # Sort by ROI (worst first)
-    active_losers.sort(key=lambda x: x["roi_30d_percent"])
+    # Find traders with negative ROI but positive account value
+    active_losers = load_active_losers(use_cache)
     
     print(f"Found {len(active_losers)} active traders with >10% losses and >$1000 capital")
     
     # Check top 10 for positions
-    api = HyperliquidAPI()
+    api = get_api()
     traders_with_positions = []
     
     print("\nChecking for open positions...")
-    for i, trader in enumerate(active_losers[:20]):  # Check top 20 losers
-        print(f"\r  Checking trader {i+1}/20...", end="", flush=True)
-        
-        try:
-            positions = api.get_open_positions(trader['address'])
+    # Check top 20 losers by ROI (worst first) without sorting the full list
+    candidates = heapq.nsmallest(20, active_losers, key=attrgetter("roi_30d_percent"))
+    
+    # Only draw progress on an interactive terminal, and only every few traders
+    show_progress = sys.stderr.isatty()
+    
+    # Fetch positions concurrently; results come back in candidate order
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = executor.map(lambda t: safe_get_positions(api, t.address), candidates)
+        for i, (trader, positions) in enumerate(zip(candidates, results), 1):
+            if show_progress and (i % 5 == 0 or i == len(candidates)):
+                print(f"\r  Checking trader {i}/{len(candidates)}...", end="", file=sys.stderr, flush=True)
+            
             if positions:
-                trader['positions'] = positions
-                traders_with_positions.append(trader)
-        except:
-            pass
+                traders_with_positions.append(trader._replace(positions=positions))
     
-    print("\n\n" + "="*80)
-    print("ACTIVE LOSING TRADERS WITH OPEN POSITIONS")
-    print("="*80)
+    if show_progress:
+        print(file=sys.stderr)
+    
+    # Build the whole report first and write it out in one call
+    lines = ["\n" + "="*80, "ACTIVE LOSING TRADERS WITH OPEN POSITIONS", "="*80]
     
     opportunities = []
     
     for i, trader in enumerate(traders_with_positions[:5], 1):
-        print(f"\n#{i} {trader['name']} ({trader['address'][:10]}...)")
-        print(f"   30-Day Loss: {trader['roi_30d_percent']:+.2f}% (${trader['pnl_30d']:+,.2f})")
-        print(f"   Current Capital: ${trader['account_value']:,.2f}")
-        print(f"   Open Positions:")
+        lines.append(f"\n#{i} {trader.name} ({trader.address[:10]}...)")
+        lines.append(f"   30-Day Loss: {trader.roi_30d_percent:+.2f}% (${trader.pnl_30d:+,.2f})")
+        lines.append(f"   Current Capital: ${trader.account_value:,.2f}")
+        lines.append(f"   Open Positions:")
         
-        for pos in trader['positions']:
+        for pos in trader.positions:
             opposite = "SHORT" if pos['side'] == "LONG" else "LONG"
             pnl = float(pos.get('unrealized_pnl', 0))
             
-            print(f"     • {pos['side']} {float(pos['size']):.4f} {pos['coin']} @ ${float(pos['entry_price']):,.2f}")
-            print(f"       Unrealized PnL: ${pnl:+,.2f}")
-            print(f"       → COUNTER: {opposite} {pos['coin']}")
+            lines.append(f"     • {pos['side']} {float(pos['size']):.4f} {pos['coin']} @ ${float(pos['entry_price']):,.2f}")
+            lines.append(f"       Unrealized PnL: ${pnl:+,.2f}")
+            lines.append(f"       → COUNTER: {opposite} {pos['coin']}")
             
-            opportunities.append({
-                "trader_name": trader['name'],
-                "trader_loss": trader['roi_30d_percent'],
-                "coin": pos['coin'],
-                "action": f"{opposite} {pos['coin']}",
-                "reason": f"Trader with {trader['roi_30d_percent']:.1f}% monthly loss is {pos['side']}",
-                "confidence": min(95, 70 + abs(trader['roi_30d_percent']) * 0.5)  # Higher loss = higher confidence
-            })
-    
-    print("\n" + "="*80)
-    print("🎯 HIGH-CONFIDENCE COUNTER-TRADE OPPORTUNITIES")
-    print("="*80)
+            opportunities.append(Opportunity(
+                trader_name=trader.name,
+                trader_loss=trader.roi_30d_percent,
+                coin=pos['coin'],
+                action=f"{opposite} {pos['coin']}",
+                reason=f"Trader with {trader.roi_30d_percent:.1f}% monthly loss is {pos['side']}",
+                confidence=min(95, 70 + abs(trader.roi_30d_percent) * 0.5)  # Higher loss = higher confidence
+            ))
+    
+    lines.extend(["\n" + "="*80, "🎯 HIGH-CONFIDENCE COUNTER-TRADE OPPORTUNITIES", "="*80])
     
     # Sort by confidence
-    opportunities.sort(key=lambda x: x['confidence'], reverse=True)
+    opportunities.sort(key=attrgetter("confidence"), reverse=True)
     
     for i, opp in enumerate(opportunities[:10], 1):
-        print(f"\n{i}. {opp['action']} (Confidence: {opp['confidence']:.0f}%)")
-        print(f"   {opp['reason']}")
+        lines.append(f"\n{i}. {opp.action} (Confidence: {opp.confidence:.0f}%)")
+        lines.append(f"   {opp.reason}")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return traders_with_positions, opportunities
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Re-parse {LEADERBOARD_FILE} instead of reading {CACHE_FILE}")
+    args = parser.parse_args()
+    
     try:
-        traders, opportunities = find_active_losers()
+        traders, opportunities = find_active_losers(use_cache=not args.no_cache)
         
         print(f"\n\n✓ Found {len(traders)} active losing traders with positions")
         print(f"✓ Generated {len(opportunities)} counter-trade opportunities")
         
         # Save for the app
-        with open("active_losers.json", "w") as f:
-            json.dump({
-                "traders": traders[:10],  # Top 10
-                "opportunities": opportunities[:20]  # Top 20 opportunities
-            }, f, indent=2)
+        with open("active_losers.json", "wb") as f:
+            f.write(orjson.dumps({
+                "traders": [trader._asdict() for trader in traders[:10]],  # Top 10
+                "opportunities": [opp._asdict() for opp in opportunities[:20]]  # Top 20 opportunities
+            }, default=_json_default, option=orjson.OPT_INDENT_2))
         
         print("✓ Data saved to active_losers.json")
         
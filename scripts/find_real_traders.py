@@ -5,9 +5,28 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
 import requests
-from backend.services import HyperliquidAPI
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.services import get_api
+from backend.services.hyperliquid_api import HTTP_POOL_SIZE
+import orjson
+
+# Reuse connections (and their TLS handshakes) across every request in this script;
+# the info endpoint is read-only, so POSTs are safe to retry too
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False  # Let the status_code checks below report failures
+    )
+))
 
 
 def find_active_traders():
@@ -17,21 +36,21 @@ def find_active_traders():
     # Try to get leaderboard data
     try:
         # Fetch from the stats API
-        response = requests.get("https://stats-data.hyperliquid.xyz/Mainnet/leaderboard")
+        response = SESSION.get("https://stats-data.hyperliquid.xyz/Mainnet/leaderboard")
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"✓ Found leaderboard data!")
             
             # Save for inspection
-            with open("leaderboard_data.json", "w") as f:
-                json.dump(data, f, indent=2)
+            with open("leaderboard_data.json", "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             print(f"✓ Saved raw data to leaderboard_data.json")
             
             # Try to parse the data structure
             if isinstance(data, list) and len(data) > 0:
                 print(f"\nFound {len(data)} entries")
                 print("\nSample entry structure:")
-                print(json.dumps(data[0], indent=2)[:500] + "...")
+                print(orjson.dumps(data[0], option=orjson.OPT_INDENT_2).decode()[:500] + "...")
             elif isinstance(data, dict):
                 print("\nData structure:")
                 print(f"Keys: {list(data.keys())}")
@@ -44,7 +63,7 @@ def find_active_traders():
     
     # Alternative: Try to get data from the API
     print("\nTrying alternative method...")
-    api = HyperliquidAPI()
+    api = get_api()
     
     # Get exchange info
     meta = api.get_meta()
@@ -53,30 +72,30 @@ def find_active_traders():
     
     # Try the info endpoint for leaderboard
     try:
-        response = requests.post(
+        response = SESSION.post(
             "https://api.hyperliquid.xyz/info",
             json={"type": "leaderboard"}
         )
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"\n✓ Got leaderboard via info endpoint")
-            with open("leaderboard_info.json", "w") as f:
-                json.dump(data, f, indent=2)
+            with open("leaderboard_info.json", "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             return data
     except Exception as e:
         print(f"Info endpoint error: {e}")
     
     # Try vault endpoint
     try:
-        response = requests.post(
+        response = SESSION.post(
             "https://api.hyperliquid.xyz/info",
             json={"type": "vaults"}
         )
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"\n✓ Got vault data")
-            with open("vault_data.json", "w") as f:
-                json.dump(data, f, indent=2)
+            with open("vault_data.json", "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             
             if isinstance(data, list) and len(data) > 0:
                 print(f"Found {len(data)} vaults")
@@ -91,14 +110,16 @@ def find_active_traders():
     return None
 
 
-def analyze_trader(api, address):
+async def analyze_trader(api, address, limiter):
     """Analyze a single trader."""
-    print(f"\nAnalyzing trader: {address}")
-    
-    # Get performance
-    perf = api.calculate_trader_performance(address, days=30)
-    positions = api.get_open_positions(address)
+    # The SDK client is blocking, so run both lookups in worker threads
+    async with limiter:
+        perf, positions = await asyncio.gather(
+            asyncio.to_thread(api.calculate_trader_performance, address, days=30),
+            asyncio.to_thread(api.get_open_positions, address)
+        )
     
+    print(f"\nAnalyzing trader: {address}")
     print(f"  → 30-Day PnL: {perf['pnl_percentage']:+.2f}%")
     print(f"  → Win Rate: {perf['win_rate']:.1f}%")
     print(f"  → Total Trades: {perf['total_trades']}")
@@ -112,6 +133,12 @@ def analyze_trader(api, address):
     return perf, positions
 
 
+async def analyze_traders(api, addresses):
+    """Analyze traders concurrently, returning results in input order."""
+    limiter = asyncio.Semaphore(HTTP_POOL_SIZE)
+    return await asyncio.gather(*(analyze_trader(api, address, limiter) for address in addresses))
+
+
 if __name__ == "__main__":
     # Find traders
     data = find_active_traders()
@@ -125,21 +152,20 @@ if __name__ == "__main__":
         # If we found vault data with leaders
         if isinstance(data, list) and len(data) > 0 and 'leader' in data[0]:
             print("\nAnalyzing some vault leaders...")
-            api = HyperliquidAPI()
+            api = get_api()
+            
+            leaders = [vault['leader'] for vault in data[:20] if 'leader' in vault]  # Check first 20 vaults
+            results = asyncio.run(analyze_traders(api, leaders))
             
             losers = []
-            for vault in data[:20]:  # Check first 20 vaults
-                if 'leader' in vault:
-                    leader = vault['leader']
-                    perf, positions = analyze_trader(api, leader)
-                    
-                    if perf['pnl_percentage'] < 0:  # Found a loser
-                        losers.append({
-                            'address': leader,
-                            'pnl': perf['pnl_percentage'],
-                            'win_rate': perf['win_rate'],
-                            'positions': positions
-                        })
+            for leader, (perf, positions) in zip(leaders, results):
+                if perf['pnl_percentage'] < 0:  # Found a loser
+                    losers.append({
+                        'address': leader,
+                        'pnl': perf['pnl_percentage'],
+                        'win_rate': perf['win_rate'],
+                        'positions': positions
+                    })
             
             if losers:
                 print("\n" + "="*80)
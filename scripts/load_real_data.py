@@ -3,13 +3,17 @@
 
 import sys
 import os
-import json
-from decimal import Decimal
+import orjson
 from datetime import datetime, date
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import insert
+from backend.database.bulk import (
+    bulk_connection, insert_open_positions, table_counts, upsert_performance, upsert_traders
+)
 from backend.database.connection import get_db
+from backend.database.validation import check_row, numeric_str, position_row
 from backend.models import Trader, TraderPerformance, Position, TradeOpportunity
 
 def main():
@@ -22,8 +26,8 @@ def main():
         print(f"Error: {json_file} not found. Run find_active_losers.py first.")
         return
     
-    with open(json_file, 'r') as f:
-        data = json.load(f)
+    with open(json_file, 'rb') as f:
+        data = orjson.loads(f.read())
         traders = data.get('traders', [])
     
     if not traders:
@@ -32,102 +36,90 @@ def main():
     
     print(f"Loading {len(traders)} traders into database...")
     
+    addresses = list(dict.fromkeys(trader_data['address'] for trader_data in traders))
+    
+    # One timestamp for the whole batch
+    now = datetime.utcnow()
+    today = date.today()
+    
     with get_db() as db:
+        conn = bulk_connection(db)
+        trader_ids = upsert_traders(conn, addresses, now)
+        
+        # Keyed by their unique columns so each row is sent once; NUMERIC values
+        # are passed as strings and cast by Postgres rather than built as Decimals
+        perf_rows = {}
+        position_rows = {}
+        opportunity_rows = {}
+        
         for i, trader_data in enumerate(traders):
             print(f"Processing trader {i+1}/{len(traders)}: {trader_data['address'][:10]}...")
             
             try:
-                # Create or get trader
-                trader = db.query(Trader).filter_by(address=trader_data['address']).first()
-                if not trader:
-                    trader = Trader(
-                        address=trader_data['address'],
-                        first_seen=datetime.utcnow(),
-                        last_updated=datetime.utcnow(),
-                        is_active=True
-                    )
-                    db.add(trader)
-                    db.flush()  # Get the ID
-                
-                # Add performance data
-                today = date.today()
-                existing_perf = db.query(TraderPerformance).filter_by(
-                    trader_id=trader.id,
-                    date=today
-                ).first()
-                
-                if not existing_perf:
-                    perf = TraderPerformance(
-                        trader_id=trader.id,
-                        date=today,
-                        pnl_percentage=Decimal(str(trader_data['roi_30d_percent'])),
-                        pnl_absolute=Decimal(str(trader_data['pnl_30d'])),
-                        account_value=Decimal(str(trader_data['account_value'])),
-                        win_rate=Decimal('0'),  # Not in our data
-                        total_trades=0,
-                        winning_trades=0,
-                        losing_trades=0,
-                        avg_win=Decimal('0'),
-                        avg_loss=Decimal('0')
-                    )
-                    db.add(perf)
+                trader_id = trader_ids[trader_data['address']]
+                trader_positions = {}
+                trader_opportunities = {}
                 
                 # Add positions
                 for pos_data in trader_data.get('positions', []):
-                    existing_pos = db.query(Position).filter_by(
-                        trader_id=trader.id,
-                        coin=pos_data['coin'],
-                        side=pos_data['side'],
-                        status='OPEN'
-                    ).first()
+                    key = (trader_id, pos_data['coin'], pos_data['side'])
+                    trader_positions[key] = position_row(trader_id, pos_data, now)
+                    
+                    # Create trade opportunity
+                    suggested_side = 'SHORT' if pos_data['side'] == 'LONG' else 'LONG'
+                    confidence = 95 if trader_data['roi_30d_percent'] < -90 else 80
                     
-                    if not existing_pos:
-                        position = Position(
-                            trader_id=trader.id,
-                            coin=pos_data['coin'],
-                            side=pos_data['side'],
-                            entry_price=Decimal(str(pos_data['entry_price'])),
-                            size=Decimal(str(pos_data['size'])),
-                            leverage=Decimal(str(pos_data.get('leverage', 1))),
-                            position_value=Decimal(str(pos_data.get('position_value', 0))),
-                            unrealized_pnl=Decimal(str(pos_data.get('unrealized_pnl', 0))),
-                            margin_used=Decimal(str(pos_data.get('margin_used', 0))),
-                            liquidation_price=Decimal(str(pos_data.get('liquidation_price', 0))),
-                            opened_at=datetime.utcnow(),
-                            status='OPEN'
-                        )
-                        db.add(position)
-                        
-                        # Create trade opportunity
-                        suggested_side = 'SHORT' if pos_data['side'] == 'LONG' else 'LONG'
-                        confidence = 95 if trader_data['roi_30d_percent'] < -90 else 80
-                        
-                        opportunity = TradeOpportunity(
-                            position_id=None,  # Will be set after position is committed
-                            trader_id=trader.id,
-                            coin=pos_data['coin'],
-                            loser_side=pos_data['side'],
-                            suggested_side=suggested_side,
-                            loser_entry_price=Decimal(str(pos_data['entry_price'])),
-                            suggested_entry_price=Decimal(str(pos_data['entry_price'])),
-                            confidence_score=Decimal(str(confidence)),
-                            status='ACTIVE'
-                        )
-                        db.add(opportunity)
+                    trader_opportunities[key] = check_row(TradeOpportunity.__table__, {
+                        'position_id': None,
+                        'trader_id': trader_id,
+                        'coin': pos_data['coin'],
+                        'loser_side': pos_data['side'],
+                        'suggested_side': suggested_side,
+                        'loser_entry_price': numeric_str(pos_data['entry_price']),
+                        'suggested_entry_price': numeric_str(pos_data['entry_price']),
+                        'confidence_score': str(confidence),
+                        'status': 'ACTIVE'
+                    })
                 
-                db.commit()
-                print(f"  ✓ Added {len(trader_data.get('positions', []))} positions")
+                # Add performance data
+                trader_perf = check_row(TraderPerformance.__table__, {
+                    'trader_id': trader_id,
+                    'date': today,
+                    'pnl_percentage': numeric_str(trader_data['roi_30d_percent']),
+                    'pnl_absolute': numeric_str(trader_data['pnl_30d']),
+                    'account_value': numeric_str(trader_data['account_value']),
+                    'win_rate': '0',  # Not in our data
+                    'total_trades': 0,
+                    'winning_trades': 0,
+                    'losing_trades': 0,
+                    'avg_win': '0',
+                    'avg_loss': '0'
+                })
+                
+                # Every row for this trader is valid, so queue them together
+                perf_rows[trader_id] = trader_perf
+                position_rows.update(trader_positions)
+                opportunity_rows.update(trader_opportunities)
+                print(f"  ✓ Queued {len(trader_positions)} positions")
                 
             except Exception as e:
                 print(f"  ✗ Error: {e}")
-                db.rollback()
-    
-    # Check final counts
-    with get_db() as db:
-        trader_count = db.query(Trader).count()
-        position_count = db.query(Position).count()
-        opp_count = db.query(TradeOpportunity).count()
         
+        # Refresh today's metrics in place and skip positions that are already open
+        upsert_performance(conn, list(perf_rows.values()))
+        inserted = insert_open_positions(conn, list(position_rows.values()))
+        
+        # Only positions that were actually inserted get an opportunity
+        new_opportunities = [
+            dict(row, position_id=inserted[key])
+            for key, row in opportunity_rows.items() if key in inserted
+        ]
+        if new_opportunities:
+            conn.execute(insert(TradeOpportunity.__table__), new_opportunities)
+        db.commit()
+        
+        trader_count, position_count, opp_count = table_counts(db, Trader, Position, TradeOpportunity)
+    
     print(f"\nDatabase loaded successfully!")
     print(f"  Traders: {trader_count}")
     print(f"  Positions: {position_count}")
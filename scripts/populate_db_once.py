@@ -3,22 +3,119 @@
 
 import sys
 import os
+import argparse
+import csv
+import io
+from datetime import datetime, date
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.services import DataCollector, TradingAnalyzer
-import json
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from backend.database.bulk import REFRESHED_PERFORMANCE_COLUMNS
+from backend.database.connection import get_db
+from backend.models import Trader
+from backend.services import DataCollector, TradingAnalyzer, get_api
+import orjson
+
+PERFORMANCE_COLUMNS = ("trader_id", "date", "pnl_percentage", "pnl_absolute", "account_value")
+POSITION_COLUMNS = (
+    "trader_id", "coin", "side", "entry_price", "size", "leverage", "position_value",
+    "unrealized_pnl", "margin_used", "liquidation_price", "opened_at", "status"
+)
+
+
+def copy_rows(cursor, table, columns, rows, conflict_target, update_columns=()):
+    """COPY rows into a staging table, then insert them into table.
+    
+    Conflicting rows are skipped, or have update_columns refreshed when given.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    
+    column_list = ", ".join(columns)
+    if update_columns:
+        conflict_action = "DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+    else:
+        conflict_action = "DO NOTHING"
+    
+    # Stage only the copied columns so table defaults such as SERIAL ids aren't evaluated twice
+    cursor.execute(
+        f"CREATE TEMP TABLE {table}_stage ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA"
+    )
+    cursor.copy_expert(f"COPY {table}_stage ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.execute(
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_stage "
+        f"ON CONFLICT {conflict_target} {conflict_action}"
+    )
+    return cursor.rowcount
+
+
+def bulk_copy(traders):
+    """Seed traders, today's performance and open positions from JSON using COPY."""
+    addresses = list(dict.fromkeys(trader['address'] for trader in traders))
+    now = datetime.utcnow()
+    today = date.today()
+    
+    with get_db() as db:
+        db.execute(
+            pg_insert(Trader.__table__).on_conflict_do_nothing(index_elements=['address']),
+            [{'address': address, 'is_active': True} for address in addresses]
+        )
+        trader_ids = dict(db.execute(
+            select(Trader.address, Trader.id).where(Trader.address.in_(addresses))
+        ).all())
+        
+        # Keyed by trader so a repeated address can't update the same row twice
+        performance_rows = {
+            trader_ids[trader['address']]: (
+                trader_ids[trader['address']], today, trader['roi_30d_percent'],
+                trader['pnl_30d'], trader['account_value']
+            )
+            for trader in traders
+        }
+        position_rows = [
+            (trader_ids[trader['address']], pos['coin'], pos['side'], pos['entry_price'], pos['size'],
+             pos.get('leverage', 1), pos.get('position_value', 0), pos.get('unrealized_pnl', 0),
+             pos.get('margin_used', 0), pos.get('liquidation_price', 0), now, 'OPEN')
+            for trader in traders
+            for pos in trader.get('positions', [])
+        ]
+        
+        # Staging tables let duplicates hit ON CONFLICT instead of failing the whole COPY
+        cursor = db.connection().connection.cursor()
+        performance_count = copy_rows(
+            cursor, "trader_performance", PERFORMANCE_COLUMNS, list(performance_rows.values()),
+            "(trader_id, date)", REFRESHED_PERFORMANCE_COLUMNS
+        )
+        position_count = copy_rows(
+            cursor, "positions", POSITION_COLUMNS, position_rows, "(trader_id, coin, side) WHERE status = 'OPEN'"
+        )
+        db.commit()
+    
+    print(f"Copied {len(trader_ids)} traders, {performance_count} performance rows and {position_count} positions")
+
 
 def main():
     """Populate database with current data."""
+    parser = argparse.ArgumentParser(description="Populate database with current losing trader data.")
+    parser.add_argument(
+        "--bulk-copy",
+        action="store_true",
+        help="seed traders and positions from active_losers.json with PostgreSQL COPY instead of the API"
+    )
+    args = parser.parse_args()
+    
     print("Populating database with current losing trader data...")
     
-    collector = DataCollector()
-    analyzer = TradingAnalyzer()
+    api = get_api()
+    collector = DataCollector(api)
+    analyzer = TradingAnalyzer(api)
     
     # Load the data from our JSON file
     try:
-        with open('active_losers.json', 'r') as f:
-            data = json.load(f)
+        with open('active_losers.json', 'rb') as f:
+            data = orjson.loads(f.read())
             traders = data.get('traders', [])
     except:
         print("No active_losers.json found, fetching fresh data...")
@@ -37,6 +134,9 @@ def main():
         results = collector.collect_multiple_traders(addresses)
         success_count = sum(1 for success in results.values() if success)
         print(f"Successfully stored {success_count}/{len(addresses)} traders in database")
+    elif args.bulk_copy:
+        print(f"Bulk copying {len(traders)} traders from JSON...")
+        bulk_copy(traders)
     else:
         print(f"Processing {len(traders)} traders from JSON...")
         for i, trader in enumerate(traders):
@@ -3,174 +3,178 @@
 
 import sys
 import os
-import json
+import ijson
+import pandas as pd
 from decimal import Decimal
 from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import case, insert, literal, select
+from backend.database.bulk import (
+    bulk_connection, insert_open_positions, table_counts, upsert_performance, upsert_traders
+)
 from backend.database.connection import get_db
+from backend.database.validation import check_row
 from backend.models import Trader, TraderPerformance, Position, TradeOpportunity
-from backend.services import HyperliquidAPI
+from backend.services import get_api
+
+# Rows per multi-row INSERT statement
+BATCH_SIZE = 1000
 
 def main():
     """Load data from existing leaderboard JSON into database."""
     print("Loading leaderboard data into database...")
     
-    # Load leaderboard data
-    with open("leaderboard_data.json", "r") as f:
-        data = json.load(f)
+    # Stream leaderboard rows into columns, keeping only the fields we filter on
+    columns = {"address": [], "account_value": [], "roi_30d_percent": [], "pnl_30d": [], "volume_30d": []}
+    row_count = 0
+    with open("leaderboard_data.json", "rb") as f:
+        for row in ijson.items(f, "leaderboardRows.item"):
+            row_count += 1
+            month_perf = dict(row.get("windowPerformances", ())).get("month")
+            if month_perf:
+                columns["address"].append(row.get("ethAddress"))
+                columns["account_value"].append(float(row.get("accountValue", 0)))
+                columns["roi_30d_percent"].append(float(month_perf.get("roi", 0)))
+                columns["pnl_30d"].append(float(month_perf.get("pnl", 0)))
+                columns["volume_30d"].append(float(month_perf.get("volume", 0)))
     
-    leaderboard = data.get("leaderboardRows", [])
-    print(f"Found {len(leaderboard)} traders in leaderboard")
+    print(f"Found {row_count} traders in leaderboard")
     
-    # Filter for losing traders with capital
-    active_losers = []
-    for row in leaderboard:
-        account_value = float(row.get("accountValue", 0))
-        if account_value < 1000:
-            continue
-            
-        month_perf = None
-        for window in row.get("windowPerformances", []):
-            if window[0] == "month":
-                month_perf = window[1]
-                break
-        
-        if month_perf:
-            roi = float(month_perf.get("roi", 0))
-            roi_percent = roi * 100
-            
-            if roi_percent < -10:  # At least -10% loss
-                active_losers.append({
-                    "address": row.get("ethAddress"),
-                    "account_value": account_value,
-                    "roi_30d_percent": roi_percent,
-                    "pnl_30d": float(month_perf.get("pnl", 0)),
-                    "volume_30d": float(month_perf.get("volume", 0))
-                })
+    # Filter for losing traders with capital in one vectorized pass
+    df = pd.DataFrame(columns)
+    df["roi_30d_percent"] *= 100
+    active_losers = df[(df["account_value"] >= 1000) & (df["roi_30d_percent"] < -10)]  # At least -10% loss
     
     print(f"Found {len(active_losers)} losing traders with >$1000 capital")
     
-    # Sort by worst performance and take top 50
-    active_losers.sort(key=lambda x: x["roi_30d_percent"])
-    test_traders = active_losers[:50]
+    # Take the 50 worst performers without sorting the rest
+    test_traders = active_losers.nsmallest(50, "roi_30d_percent").to_dict("records")
     
     print(f"Loading top {len(test_traders)} worst performers into database...")
     
-    api = HyperliquidAPI()
+    api = get_api()
+    now = datetime.utcnow()
+    today = date.today()
+    addresses = list(dict.fromkeys(trader["address"] for trader in test_traders))
+    
+    # Fetch every trader's state concurrently before opening the session; errors
+    # are re-raised by .result() in the loop so each trader still fails on its own
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        user_states = {address: executor.submit(api.get_user_state, address) for address in addresses}
     
     with get_db() as db:
+        conn = bulk_connection(db, BATCH_SIZE)
+        trader_ids = upsert_traders(conn, addresses, now)
+        
+        # Collect plain row dicts keyed by their unique columns and write them after
+        # the loop. Rows are validated as they're built so bad data drops one
+        # trader, not the batch
+        perf_rows = {}
+        position_rows = {}
+        confidence_by_trader = {}
+        
         for i, trader_data in enumerate(test_traders):
             address = trader_data["address"]
             print(f"Processing {i+1}/{len(test_traders)}: {address[:10]}... ({trader_data['roi_30d_percent']:.1f}%)")
             
             try:
-                # Create trader
-                trader = db.query(Trader).filter_by(address=address).first()
-                if not trader:
-                    trader = Trader(
-                        address=address,
-                        first_seen=datetime.utcnow(),
-                        last_updated=datetime.utcnow(),
-                        is_active=True
-                    )
-                    db.add(trader)
-                    db.flush()
+                trader_id = trader_ids[address]
                 
                 # Add performance
-                today = date.today()
-                existing_perf = db.query(TraderPerformance).filter_by(
-                    trader_id=trader.id,
-                    date=today
-                ).first()
+                perf_rows[trader_id] = check_row(TraderPerformance.__table__, {
+                    "trader_id": trader_id,
+                    "date": today,
+                    "pnl_percentage": Decimal(str(trader_data["roi_30d_percent"])),
+                    "pnl_absolute": Decimal(str(trader_data["pnl_30d"])),
+                    "account_value": Decimal(str(trader_data["account_value"])),
+                    "win_rate": Decimal('0'),
+                    "total_trades": 0,
+                    "winning_trades": 0,
+                    "losing_trades": 0,
+                    "avg_win": Decimal('0'),
+                    "avg_loss": Decimal('0')
+                })
                 
-                if not existing_perf:
-                    perf = TraderPerformance(
-                        trader_id=trader.id,
-                        date=today,
-                        pnl_percentage=Decimal(str(trader_data["roi_30d_percent"])),
-                        pnl_absolute=Decimal(str(trader_data["pnl_30d"])),
-                        account_value=Decimal(str(trader_data["account_value"])),
-                        win_rate=Decimal('0'),
-                        total_trades=0,
-                        winning_trades=0,
-                        losing_trades=0,
-                        avg_win=Decimal('0'),
-                        avg_loss=Decimal('0')
-                    )
-                    db.add(perf)
+                # Opportunity confidence depends only on the trader's loss from the
+                # leaderboard, not on whatever performance row today already has
+                confidence_by_trader[trader_id] = 95 if trader_data["roi_30d_percent"] < -90 else 85
                 
                 # Get positions from API
                 try:
-                    user_state = api.get_user_state(address)
+                    user_state = user_states[address].result()
                     if user_state and 'assetPositions' in user_state:
                         positions = user_state['assetPositions']
-                        position_count = 0
+                        trader_positions = {}
                         
                         for pos in positions:
                             if 'position' in pos and pos['position']['szi'] != '0':
                                 pos_data = pos['position']
-                                size = float(pos_data['szi'])
+                                # The API sends numbers as strings, so parse them straight into Decimals
+                                size = Decimal(pos_data['szi'])
                                 side = 'LONG' if size > 0 else 'SHORT'
+                                entry_price = Decimal(pos_data.get('entryPx') or '0')
                                 
-                                existing_pos = db.query(Position).filter_by(
-                                    trader_id=trader.id,
-                                    coin=pos_data['coin'],
-                                    side=side,
-                                    status='OPEN'
-                                ).first()
-                                
-                                if not existing_pos:
-                                    position = Position(
-                                        trader_id=trader.id,
-                                        coin=pos_data['coin'],
-                                        side=side,
-                                        entry_price=Decimal(str(pos_data.get('entryPx', 0))),
-                                        size=Decimal(str(abs(size))),
-                                        leverage=Decimal('1'),
-                                        position_value=Decimal(str(pos_data.get('positionValue', 0))),
-                                        unrealized_pnl=Decimal(str(pos_data.get('unrealizedPnl', 0))),
-                                        margin_used=Decimal('0'),
-                                        liquidation_price=Decimal('0'),
-                                        opened_at=datetime.utcnow(),
-                                        status='OPEN'
-                                    )
-                                    db.add(position)
-                                    position_count += 1
-                                    
-                                    # Create opportunity
-                                    suggested_side = 'SHORT' if side == 'LONG' else 'LONG'
-                                    confidence = 95 if trader_data["roi_30d_percent"] < -90 else 85
-                                    
-                                    opportunity = TradeOpportunity(
-                                        trader_id=trader.id,
-                                        coin=pos_data['coin'],
-                                        loser_side=side,
-                                        suggested_side=suggested_side,
-                                        loser_entry_price=Decimal(str(pos_data.get('entryPx', 0))),
-                                        suggested_entry_price=Decimal(str(pos_data.get('entryPx', 0))),
-                                        confidence_score=Decimal(str(confidence)),
-                                        status='ACTIVE'
-                                    )
-                                    db.add(opportunity)
+                                key = (trader_id, pos_data['coin'], side)
+                                trader_positions[key] = check_row(Position.__table__, {
+                                    "trader_id": trader_id,
+                                    "coin": pos_data['coin'],
+                                    "side": side,
+                                    "entry_price": entry_price,
+                                    "size": abs(size),
+                                    "leverage": Decimal('1'),
+                                    "position_value": Decimal(pos_data.get('positionValue') or '0'),
+                                    "unrealized_pnl": Decimal(pos_data.get('unrealizedPnl') or '0'),
+                                    "margin_used": Decimal('0'),
+                                    "liquidation_price": Decimal('0'),
+                                    "opened_at": now,
+                                    "status": 'OPEN'
+                                })
                         
-                        print(f"  ✓ Added {position_count} positions")
+                        position_rows.update(trader_positions)
+                        print(f"  ✓ Queued {len(trader_positions)} positions")
                 except Exception as e:
                     print(f"  ⚠ Could not get positions: {e}")
                 
-                db.commit()
-                
             except Exception as e:
                 print(f"  ✗ Error: {e}")
-                db.rollback()
-    
-    # Check final counts
-    with get_db() as db:
-        trader_count = db.query(Trader).count()
-        position_count = db.query(Position).count()
-        opp_count = db.query(TradeOpportunity).count()
         
+        # Refresh today's metrics in place and skip positions that are already open
+        upsert_performance(conn, list(perf_rows.values()))
+        new_position_ids = list(insert_open_positions(conn, list(position_rows.values())).values())
+        
+        # Generate opportunities for the newly inserted positions server-side,
+        # mapping each position's trader to its confidence tier
+        if new_position_ids:
+            opportunity_source = (
+                select(
+                    Position.id,
+                    Position.trader_id,
+                    Position.coin,
+                    Position.side,
+                    case((Position.side == 'LONG', 'SHORT'), else_='LONG'),
+                    Position.entry_price,
+                    Position.entry_price,
+                    case(confidence_by_trader, value=Position.trader_id, else_=85),
+                    literal('ACTIVE')
+                )
+                .where(Position.id.in_(new_position_ids))
+            )
+            conn.execute(insert(TradeOpportunity.__table__).from_select(
+                [
+                    "position_id", "trader_id", "coin", "loser_side", "suggested_side",
+                    "loser_entry_price", "suggested_entry_price", "confidence_score", "status"
+                ],
+                opportunity_source
+            ))
+        
+        # Commit the whole load once
+        db.commit()
+        
+        trader_count, position_count, opp_count = table_counts(db, Trader, Position, TradeOpportunity)
+    
     print(f"\nDatabase loaded successfully!")
     print(f"  Traders: {trader_count}")
     print(f"  Positions: {position_count}")
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """
 WSGI entry point for production deployment
+
+Set SBF_SKIP_DB_INIT=1 to skip schema initialization at startup, e.g. for
+extra workers or instances started after the schema is already in place.
 """
 import os
 import sys
 import logging
+from functools import lru_cache
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,11 +21,12 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
 def create_production_app():
     """Create Flask app for production with database initialization."""
     try:
         from backend.app import create_app
-        from backend.database.connection import init_db, test_connection
+        from backend.database.connection import init_db
         
         logger.info("Starting Hyperliquid API in production mode")
         
@@ -32,21 +37,16 @@ def create_production_app():
         else:
             logger.info(f"Database URL configured: {database_url[:50]}...")
             
-            # Test database connection
-            try:
-                if test_connection():
-                    logger.info("Database connection successful")
-                    # Initialize database schema
-                    try:
-                        init_db()
-                        logger.info("Database initialized successfully")
-                    except Exception as e:
-                        logger.warning(f"Database initialization failed: {e}")
-                        # Don't fail completely - database might already be initialized
-                else:
-                    logger.warning("Database connection failed - continuing without database")
-            except Exception as e:
-                logger.warning(f"Database setup error: {e} - continuing without database")
+            if os.getenv("SBF_SKIP_DB_INIT") == "1":
+                logger.info("SBF_SKIP_DB_INIT set - skipping database initialization")
+            else:
+                # The schema is idempotent, so initialize directly instead of probing
+                # with a separate connection first
+                try:
+                    init_db()
+                    logger.info("Database initialized successfully")
+                except Exception as e:
+                    logger.warning(f"Database setup error: {e} - continuing without database")
         
         # Create Flask app
         app = create_app()